@@ -0,0 +1,136 @@
+# backend/admission.py
+import asyncio
+import json
+import os
+from typing import Dict, Optional
+
+from metrics import Counter, Gauge, registry
+
+# Concurrent requests per endpoint class, and how many more may wait briefly for a slot.
+# Everything else (health, login, small lists) is never queued behind these.
+ADMISSION_UPLOAD_LIMIT = int(os.getenv("ADMISSION_UPLOAD_LIMIT", "4"))
+ADMISSION_UPLOAD_QUEUE = int(os.getenv("ADMISSION_UPLOAD_QUEUE", "8"))
+ADMISSION_HEAVY_LIMIT = int(os.getenv("ADMISSION_HEAVY_LIMIT", "4"))
+ADMISSION_HEAVY_QUEUE = int(os.getenv("ADMISSION_HEAVY_QUEUE", "4"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2.0"))
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "2"))
+
+UPLOAD_PATHS = {"/submit_reimbursement", "/submit_payment", "/submit_batch"}
+# Always heavy: they walk a whole date range or the full text index
+HEAVY_PATHS = {"/export_requests", "/search_requests"}
+# Heavy only when unpaged (no limit/cursor): all-time lists read in one go
+UNPAGED_HEAVY_PATHS = {"/history_requests", "/admin/paid_records"}
+
+
+class Limiter:
+    """At most `limit` concurrent holders; up to `queue_size` more wait `timeout` seconds, the rest are refused."""
+
+    def __init__(self, name: str, limit: int, queue_size: int, timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    async def acquire(self) -> bool:
+        if self._semaphore.locked() and self.waiting >= self.queue_size:
+            self.rejected += 1
+            return False
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        self.admitted += 1
+        return True
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "limit": self.limit,
+            "queue_size": self.queue_size,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+limiters = {
+    "upload": Limiter("upload", ADMISSION_UPLOAD_LIMIT, ADMISSION_UPLOAD_QUEUE, ADMISSION_QUEUE_TIMEOUT),
+    "heavy": Limiter("heavy", ADMISSION_HEAVY_LIMIT, ADMISSION_HEAVY_QUEUE, ADMISSION_QUEUE_TIMEOUT),
+}
+
+registry.register(Gauge("app_admission_active", "Requests holding an admission slot", ("class",), collect=lambda: {
+    (name,): limiter.active for name, limiter in limiters.items()}))
+registry.register(Gauge("app_admission_queue_depth", "Requests waiting for an admission slot", ("class",), collect=lambda: {
+    (name,): limiter.waiting for name, limiter in limiters.items()}))
+admission_rejections = registry.register(Counter(
+    "app_admission_rejections_total", "Requests refused with 503 by admission control", ("class",)))
+
+
+def classify(scope) -> Optional[str]:
+    path = scope["path"]
+    if scope["method"] == "POST" and path in UPLOAD_PATHS:
+        return "upload"
+    if scope["method"] == "GET":
+        if path in HEAVY_PATHS:
+            return "heavy"
+        if path in UNPAGED_HEAVY_PATHS:
+            query = scope.get("query_string", b"")
+            if b"limit=" not in query and b"cursor=" not in query:
+                return "heavy"
+    return None
+
+
+def stats() -> Dict[str, Dict[str, float]]:
+    return {name: limiter.stats() for name, limiter in limiters.items()}
+
+
+class AdmissionMiddleware:
+    """Pure ASGI middleware: bounded concurrency per endpoint class, fast 503 + Retry-After beyond it."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        name = classify(scope)
+        if name is None:
+            return await self.app(scope, receive, send)
+
+        limiter = limiters[name]
+        if not await limiter.acquire():
+            admission_rejections.inc((name,))
+            return await _busy(send)
+        try:
+            # Held until the response is fully sent, so streamed exports count for their whole duration
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+async def _busy(send):
+    body = json.dumps({"detail": "Server busy, please retry shortly"}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(ADMISSION_RETRY_AFTER).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,11 @@
+# backend/archive_requests.py
+# Moves Paid requests older than ARCHIVE_AFTER_DAYS into requests_archive. Run it periodically
+# (e.g. nightly from cron); re-running or interrupting it is safe.
+import asyncio
+from db import archive_paid_requests
+
+async def main():
+    await archive_paid_requests()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,7 @@
+# backend/bench
+# Load-test and benchmark scripts. Run from the backend directory, e.g.:
+#   python -m bench.seed --reset --users 200 --requests 100000
+#   python -m bench.workload --url http://localhost:8000 --out before.json
+#   python -m bench.compare before.json after.json
+#   python -m bench.explain_check --archive-days 180
+#   python -m bench.login_storm --url http://localhost:8000
@@ -0,0 +1,43 @@
+# backend/bench/common.py
+import json
+import subprocess
+from typing import Optional
+
+import httpx
+
+
+async def login(http: httpx.AsyncClient, username: str, password: str) -> str:
+    res = await http.post("/token", data={"username": username, "password": password})
+    res.raise_for_status()
+    return res.json()["access_token"]
+
+
+async def ensure_staff(http: httpx.AsyncClient, admin_token: str, username: str, password: str):
+    res = await http.post(
+        "/create_user",
+        data={"username": username, "password": password, "role": "staff"},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    # 400 means the user already exists, which is fine for repeated runs
+    if res.status_code not in (200, 400):
+        res.raise_for_status()
+
+
+def git_revision() -> Optional[str]:
+    """Commit the benchmark ran against, so reports from different runs can be lined up."""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(report: dict, path: Optional[str]):
+    # Sorted keys keep reports from different commits diffable line by line
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if path:
+        with open(path, "w") as f:
+            f.write(text + "\n")
+    print(text)
@@ -0,0 +1,49 @@
+# backend/bench/compare.py
+"""
+Compare two bench.workload reports, e.g. from the commits before and after a change.
+
+    python -m bench.compare before.json after.json
+
+Prints p50/p95/p99 and throughput per operation with the relative change; a positive
+latency change is a slowdown.
+"""
+import argparse
+import json
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+
+
+def _delta(old: float, new: float) -> str:
+    if not old:
+        return "n/a"
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def compare(before: dict, after: dict) -> list:
+    rows = []
+    names = ["total"] + sorted(set(before.get("operations", {})) | set(after.get("operations", {})))
+    for name in names:
+        old = before.get(name) if name == "total" else before.get("operations", {}).get(name)
+        new = after.get(name) if name == "total" else after.get("operations", {}).get(name)
+        if not old or not new:
+            continue
+        for metric in METRICS:
+            rows.append((name, metric, old[metric], new[metric], _delta(old[metric], new[metric])))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Diff two workload reports")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    print(f"before: {before['meta'].get('git')} {before['meta'].get('label') or ''}")
+    print(f"after:  {after['meta'].get('git')} {after['meta'].get('label') or ''}")
+    print(f"{'operation':<15}{'metric':<16}{'before':>12}{'after':>12}{'change':>10}")
+    for name, metric, old, new, delta in compare(before, after):
+        print(f"{name:<15}{metric:<16}{old:>12}{new:>12}{delta:>10}")
@@ -0,0 +1,202 @@
+# backend/bench/explain_check.py
+"""
+Index regression check: calls every endpoint once against seeded data, captures the MongoDB
+commands each call sends and explains them. Exits non-zero if a winning plan contains a
+COLLSCAN or a blocking in-memory SORT that is not explicitly allowed in ALLOWED below.
+
+    python -m bench.seed --reset --requests 20000
+    python -m bench.explain_check --archive-days 180
+
+Needs a real MongoDB (explain cannot be emulated) and runs the app in-process against the
+configured DB_NAME, so point it at a scratch database: it submits and updates requests.
+"""
+import argparse
+import copy
+import io
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+
+from bson.son import SON
+from pymongo import MongoClient, monitoring
+
+EXPLAINABLE = {"find", "aggregate", "count", "distinct", "findAndModify", "update", "delete"}
+BAD_STAGES = {"COLLSCAN", "SORT"}
+# (endpoint label, stage) pairs that are acceptable by design, with the reason
+ALLOWED = {
+    ("GET /admin/users", "COLLSCAN"): "lists every account; users is small and read whole",
+    ("GET /dashboard admin", "COLLSCAN"): "includes the /admin/users list",
+    ("GET /search_requests text", "SORT"): "relevance is computed per text match, there is no index order for it",
+    ("GET /search_requests text by date", "SORT"): "text matches come from the text index, not in date order",
+    ("GET /search_requests request_id", "SORT"): "a selective ID prefix plus a small sort beats a date-ordered scan",
+}
+
+
+class CommandCapture(monitoring.CommandListener):
+    """Records explainable commands sent while `label` is set."""
+
+    def __init__(self):
+        self.label = None
+        self.commands = []
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        if self.label and event.command_name in EXPLAINABLE:
+            with self._lock:
+                self.commands.append((self.label, event.database_name, copy.deepcopy(dict(event.command))))
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+# Registered globally before db.py creates its client, so the app's own client reports to it
+capture = CommandCapture()
+monitoring.register(capture)
+
+
+def explain_targets(command: dict) -> list:
+    """Strip driver-added fields; split multi-statement writes, since explain takes one at a time."""
+    name = next(iter(command))
+    cleaned = SON((k, v) for k, v in command.items()
+                  if not k.startswith("$") and k not in ("lsid", "txnNumber", "readConcern", "writeConcern"))
+    if name in ("update", "delete"):
+        key = "updates" if name == "update" else "deletes"
+        return [SON([*((k, v) for k, v in cleaned.items() if k != key), (key, [stmt])]) for stmt in cleaned.get(key, [])]
+    if name == "aggregate":
+        cleaned["cursor"] = {}
+    return [cleaned]
+
+
+def plan_stages(explain: dict) -> set:
+    """Every stage name in the winning plan(s) of an explain result, whatever its layout."""
+    stages = set()
+
+    def walk(node, in_winning):
+        if isinstance(node, dict):
+            if in_winning and isinstance(node.get("stage"), str):
+                stages.add(node["stage"])
+            for key, value in node.items():
+                if key == "rejectedPlans":
+                    continue
+                walk(value, in_winning or key == "winningPlan")
+        elif isinstance(node, list):
+            for item in node:
+                walk(item, in_winning)
+
+    walk(explain, False)
+    return stages
+
+
+def run_endpoints(tc, args) -> None:
+    def token(username, password):
+        res = tc.post("/token", data={"username": username, "password": password})
+        res.raise_for_status()
+        return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+    admin = token(args.admin_user, args.admin_pass)
+    staff = token(args.staff_user, args.staff_pass)
+    page = tc.get("/history_requests", params={"limit": 2}, headers=admin).json()
+    if not page["items"]:
+        raise SystemExit("No requests found; seed the database first (python -m bench.seed)")
+    sample = page["items"][0]
+    since = (datetime.now(timezone.utc) - timedelta(days=90)).strftime("%Y-%m-%d")
+    paid_page = tc.get("/admin/paid_records", params={"limit": 2}, headers=admin).json()
+
+    calls = [
+        ("POST /token", "post", "/token", None, {"data": {"username": args.staff_user, "password": args.staff_pass}}),
+        ("GET /my_requests", "get", "/my_requests", staff, {}),
+        ("GET /admin/requests", "get", "/admin/requests", admin, {}),
+        ("GET /admin/requests type", "get", "/admin/requests", admin, {"params": {"type": "payment"}}),
+        ("GET /admin/pending_summary", "get", "/admin/pending_summary", admin, {}),
+        ("GET /dashboard admin", "get", "/dashboard", admin, {}),
+        ("GET /dashboard staff", "get", "/dashboard", staff, {}),
+        ("GET /history_requests staff", "get", "/history_requests", staff, {"params": {"limit": 50}}),
+        ("GET /history_requests staff all", "get", "/history_requests", staff, {}),
+        ("GET /history_requests admin", "get", "/history_requests", admin, {"params": {"limit": 50}}),
+        ("GET /admin/paid_records", "get", "/admin/paid_records", admin, {"params": {"limit": 50}}),
+        ("GET /search_requests text", "get", "/search_requests", admin, {"params": {"q": "taxi"}}),
+        ("GET /search_requests text by date", "get", "/search_requests", admin, {"params": {"q": "taxi", "sort": "date"}}),
+        ("GET /search_requests request_id", "get", "/search_requests", admin, {"params": {"request_id": sample["request_id"][:4]}}),
+        ("GET /search_requests filters", "get", "/search_requests", admin,
+         {"params": {"min_amount": 100, "status": "Approved", "start": since}}),
+        ("GET /search_requests staff", "get", "/search_requests", staff, {"params": {"status": "Paid"}}),
+        ("GET /admin/reports/spend", "get", "/admin/reports/spend", admin, {}),
+        ("GET /admin/reports/spend staff", "get", "/admin/reports/spend", admin,
+         {"params": {"staffName": args.staff_user, "type": "payment"}}),
+        ("GET /export_requests", "get", "/export_requests", admin, {"params": {"start": since}}),
+        ("GET /export_requests paid_date", "get", "/export_requests", admin, {"params": {"date_field": "paid_date"}}),
+        ("GET /export_requests staff", "get", "/export_requests", staff, {"params": {"format": "ndjson"}}),
+        ("GET /attachments", "get", f"/attachments/{sample['proof_filename']}", admin, {}),
+        ("PATCH /admin/requests", "patch", f"/admin/requests/{sample['request_id']}", admin, {"json": {"status": "Approved"}}),
+        ("POST /admin/requests/bulk_status", "post", "/admin/requests/bulk_status", admin,
+         {"json": {"ids": [r["request_id"] for r in page["items"]], "status": "Paid"}}),
+        ("POST /submit_payment", "post", "/submit_payment", staff, {
+            "data": {"date": datetime.now(timezone.utc).strftime("%Y-%m-%d"), "purpose": "explain check", "amount": "1"},
+            "files": {"proof": ("check.pdf", io.BytesIO(b"%PDF-1.4\n%%EOF\n"), "application/pdf")},
+        }),
+        ("GET /admin/users", "get", "/admin/users", admin, {}),
+    ]
+    # Cursor pages add the keyset $or to the query, which needs its own plan
+    if page["next"]:
+        calls.append(("GET /history_requests page 2", "get", "/history_requests", admin,
+                      {"params": {"limit": 50, "cursor": page["next"]}}))
+    if paid_page["next"]:
+        calls.append(("GET /admin/paid_records page 2", "get", "/admin/paid_records", admin,
+                      {"params": {"limit": 50, "cursor": paid_page["next"]}}))
+    for label, method, path, headers, kwargs in calls:
+        capture.label = label
+        try:
+            res = getattr(tc, method)(path, headers=headers, **kwargs)
+        finally:
+            capture.label = None
+        if res.status_code >= 400:
+            print(f"⚠️ {label}: HTTP {res.status_code} {res.text[:200]}")
+
+
+def main(args) -> int:
+    from fastapi.testclient import TestClient
+    import db
+    import main as app_module
+
+    with TestClient(app_module.app) as tc:
+        if args.archive_days is not None:
+            # Move some history into the archive so the merged history paths get explained too
+            cutoff = datetime.now(timezone.utc) - timedelta(days=args.archive_days)
+            tc.portal.call(db.archive_paid_requests, cutoff)
+        run_endpoints(tc, args)
+
+    sync_client = MongoClient(db.MONGO_URI, serverSelectionTimeoutMS=5000)
+    problems, checked = [], 0
+    for label, database, command in capture.commands:
+        for target in explain_targets(command):
+            explain = sync_client[database].command(SON([("explain", target), ("verbosity", "queryPlanner")]))
+            stages = plan_stages(explain)
+            checked += 1
+            collection = target[next(iter(target))]
+            for stage in sorted(stages & BAD_STAGES):
+                reason = ALLOWED.get((label, stage))
+                if reason:
+                    print(f"   {label:<40} {collection:<18} {stage:<9} allowed: {reason}")
+                else:
+                    problems.append((label, collection, stage))
+                    print(f"❌ {label:<40} {collection:<18} {stage}")
+    sync_client.close()
+
+    print(f"Explained {checked} command(s) from {len({c[0] for c in capture.commands})} endpoint call(s); "
+          f"{len(problems)} problem(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if any endpoint query scans a collection or sorts in memory")
+    parser.add_argument("--admin-user", default="nou")
+    parser.add_argument("--admin-pass", default=os.getenv("ADMIN_PASS", "nou123"))
+    parser.add_argument("--staff-user", default="bench_user_00000", help="a bench.seed account")
+    parser.add_argument("--staff-pass", default=os.getenv("BENCH_PASS", "bench_pw"))
+    parser.add_argument("--archive-days", type=int, default=None,
+                        help="archive Paid requests older than this first, to cover the archive reads")
+    sys.exit(main(parser.parse_args()))
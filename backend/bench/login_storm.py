@@ -0,0 +1,100 @@
+# backend/bench/login_storm.py
+"""
+Login-storm benchmark: measures /health and /my_requests latency while /token is hammered.
+
+    python -m bench.login_storm --url http://localhost:8000 --logins 32 --duration 20
+
+Prints a JSON report with p50/p95/p99 for each probe, once at idle and once during the storm.
+If bcrypt runs off the event loop, the two phases should look the same.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import httpx
+
+from bench.common import ensure_staff, login
+from bench.stats import summarize
+
+
+async def _probe(http: httpx.AsyncClient, path: str, headers: dict, stop: asyncio.Event, interval: float):
+    samples, errors = [], 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            res = await http.get(path, headers=headers)
+            if res.status_code != 200:
+                errors += 1
+        except httpx.HTTPError:
+            errors += 1
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+    return samples, errors
+
+
+async def _hammer_logins(http: httpx.AsyncClient, username: str, password: str, stop: asyncio.Event):
+    samples, errors = [], 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            res = await http.post("/token", data={"username": username, "password": password})
+            if res.status_code != 200:
+                errors += 1
+        except httpx.HTTPError:
+            errors += 1
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples, errors
+
+
+async def _phase(http, staff_headers, duration, interval, logins, username, password):
+    stop = asyncio.Event()
+    probes = [
+        asyncio.create_task(_probe(http, "/health", {}, stop, interval)),
+        asyncio.create_task(_probe(http, "/my_requests", staff_headers, stop, interval)),
+    ]
+    stormers = [asyncio.create_task(_hammer_logins(http, username, password, stop)) for _ in range(logins)]
+    await asyncio.sleep(duration)
+    stop.set()
+    (health, health_err), (mine, mine_err) = await asyncio.gather(*probes)
+    report = {
+        "/health": summarize(health, duration, health_err),
+        "/my_requests": summarize(mine, duration, mine_err),
+    }
+    if stormers:
+        results = await asyncio.gather(*stormers)
+        token_samples = [s for samples, _ in results for s in samples]
+        report["/token"] = summarize(token_samples, duration, sum(e for _, e in results))
+    return report
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.logins + 8)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=limits) as http:
+        admin_token = await login(http, args.admin_user, args.admin_pass)
+        await ensure_staff(http, admin_token, args.staff_user, args.staff_pass)
+        staff_token = await login(http, args.staff_user, args.staff_pass)
+        staff_headers = {"Authorization": f"Bearer {staff_token}"}
+
+        report = {
+            "url": args.url,
+            "logins_concurrency": args.logins,
+            "duration_s": args.duration,
+            "idle": await _phase(http, staff_headers, args.duration, args.interval, 0, args.staff_user, args.staff_pass),
+            "storm": await _phase(http, staff_headers, args.duration, args.interval, args.logins, args.staff_user, args.staff_pass),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Login-storm latency benchmark")
+    parser.add_argument("--url", default=os.getenv("BENCH_URL", "http://localhost:8000"))
+    parser.add_argument("--admin-user", default="nou")
+    parser.add_argument("--admin-pass", default=os.getenv("ADMIN_PASS", "nou123"))
+    parser.add_argument("--staff-user", default="bench_staff")
+    parser.add_argument("--staff-pass", default="bench_staff_pw")
+    parser.add_argument("--logins", type=int, default=32, help="concurrent /token clients during the storm")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per phase")
+    parser.add_argument("--interval", type=float, default=0.05, help="pause between probe requests")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,161 @@
+# backend/bench/seed.py
+"""
+Bulk-seed the configured database with synthetic users and requests for benchmarking.
+
+    python -m bench.seed --reset --users 200 --requests 100000
+
+Requests are spread over the last --months months with a realistic status mix, get real
+request IDs from the shared counter and point at a handful of shared proof blobs, so every
+endpoint (lists, search, history, attachments) works on the seeded data. Inserts go through
+batched insert_many; summaries, rollups and blob refcounts are rebuilt once at the end.
+The same --seed reproduces the same mix of users, amounts, statuses and relative dates;
+timestamps are anchored at the current time and request IDs continue the live counter, so
+the stored data still differs between runs.
+
+--reset removes existing requests first but keeps users and counters, so it is safe against a
+running server: the default admin still logs in and new request IDs continue the sequence.
+Blobs no longer referenced afterwards get refcount 0; python gc_blobs.py removes them.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from passlib.context import CryptContext
+
+from blobstore import blob_store
+from db import (
+    clear_request_data, init_indexes, next_request_ids, recompute_request_summaries,
+    recompute_spend_rollups, requests_collection, users_collection,
+)
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+STAFF_PREFIX = "bench_user_"
+PROOF_BLOBS = 16
+STATUS_WEIGHTS = {"Pending": 20, "Approved": 15, "Rejected": 5, "Paid": 60}
+WORDS = [
+    "taxi", "hotel", "lunch", "printer", "toner", "fuel", "parking", "training", "laptop",
+    "internet", "office", "supplies", "courier", "conference", "flight", "visa", "phone", "meals",
+]
+
+
+def _write_proof_blobs(rng: random.Random) -> list:
+    """A few small distinct PDFs placed straight into the blob store; returns (sha256, size) pairs."""
+    blobs = []
+    for i in range(PROOF_BLOBS):
+        data = b"%PDF-1.4\n% bench proof " + str(i).encode() + b"\n" + rng.randbytes(2048) + b"\n%%EOF\n"
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = blob_store.path_for(sha256)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+        blobs.append((sha256, len(data)))
+    return blobs
+
+
+async def seed_users(count: int, password: str, batch: int) -> list:
+    # bcrypt once: every synthetic account shares the same password hash
+    hashed = pwd_context.hash(password)
+    now = datetime.now(timezone.utc)
+    names = [f"{STAFF_PREFIX}{i:05d}" for i in range(count)]
+    existing = {u["username"] async for u in users_collection.find(
+        {"username": {"$regex": f"^{STAFF_PREFIX}"}}, {"username": 1}
+    )}
+    docs = [
+        {"username": name, "hashed_password": hashed, "role": "staff", "created_at": now}
+        for name in names if name not in existing
+    ]
+    for i in range(0, len(docs), batch):
+        await users_collection.insert_many(docs[i:i + batch], ordered=False)
+    return names
+
+
+def _request_doc(rng: random.Random, req_id: str, staff: str, created_at: datetime, blob: tuple) -> dict:
+    req_type = rng.choice(("reimbursement", "payment"))
+    status = rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()))[0]
+    text = " ".join(rng.sample(WORDS, 3))
+    doc = {
+        "type": req_type,
+        "request_id": req_id,
+        "staffName": staff,
+        "date": created_at.strftime("%Y-%m-%d"),
+        "description" if req_type == "reimbursement" else "purpose": text,
+        "amount": round(rng.uniform(1, 500), 2),
+        "status": status,
+        "proof_filename": f"{staff}_{int(created_at.timestamp())}_{req_id}.pdf",
+        "proof_blob": blob[0],
+        "proof_size": blob[1],
+        "created_at": created_at,
+    }
+    if status in ("Approved", "Paid"):
+        doc["approved_date"] = created_at + timedelta(hours=rng.randint(1, 72))
+    if status == "Paid":
+        doc["paid_date"] = doc["approved_date"] + timedelta(hours=rng.randint(1, 240))
+    return doc
+
+
+async def seed_requests(count: int, staff: list, months: int, batch: int, rng: random.Random) -> int:
+    blobs = _write_proof_blobs(rng)
+    now = datetime.now(timezone.utc)
+    span = timedelta(days=30 * months).total_seconds()
+    inserted = 0
+    while inserted < count:
+        size = min(batch, count - inserted)
+        # One counter round trip per batch, so seeded IDs never collide with live submissions
+        ids = await next_request_ids(size)
+        # Ascending creation times within a batch, like real traffic
+        offsets = sorted((rng.uniform(0, span) for _ in range(size)), reverse=True)
+        docs = [
+            _request_doc(rng, req_id, rng.choice(staff), now - timedelta(seconds=offset), rng.choice(blobs))
+            for req_id, offset in zip(ids, offsets)
+        ]
+        await requests_collection.insert_many(docs, ordered=False)
+        inserted += size
+        print(f"  {inserted}/{count} requests")
+    return inserted
+
+
+async def main(args):
+    rng = random.Random(args.seed)
+    if args.reset:
+        await clear_request_data()
+    started = time.perf_counter()
+    staff = await seed_users(args.users, args.password, args.batch)
+    users_s = time.perf_counter() - started
+    await seed_requests(args.requests, staff, args.months, args.batch, rng)
+    requests_s = time.perf_counter() - started - users_s
+
+    # Indexes, counters and derived collections, exactly as the app builds them on startup
+    await init_indexes()
+    await recompute_request_summaries()
+    await recompute_spend_rollups()
+    await blob_store.recount()
+    total_s = time.perf_counter() - started
+
+    print(json.dumps({
+        "users": args.users,
+        "requests": args.requests,
+        "seed": args.seed,
+        "users_s": round(users_s, 2),
+        "requests_s": round(requests_s, 2),
+        "requests_per_s": round(args.requests / requests_s, 1) if requests_s > 0 else 0.0,
+        "total_s": round(total_s, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-seed synthetic users and requests")
+    parser.add_argument("--users", type=int, default=100, help="staff accounts (bench_user_00000...)")
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--months", type=int, default=12, help="spread creation dates over this many months")
+    parser.add_argument("--batch", type=int, default=5_000, help="documents per insert_many")
+    parser.add_argument("--password", default=os.getenv("BENCH_PASS", "bench_pw"), help="password of every seeded user")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the status, amount and date mix")
+    parser.add_argument("--reset", action="store_true", help="delete existing requests first (users and counters are kept)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,25 @@
+# backend/bench/stats.py
+import math
+from typing import Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples (0 for an empty list)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples_ms: List[float], duration_s: float, errors: int = 0) -> Dict[str, float]:
+    """p50/p95/p99 latency plus throughput for one series of request timings."""
+    return {
+        "count": len(samples_ms),
+        "errors": errors,
+        "p50_ms": round(percentile(samples_ms, 50), 3),
+        "p95_ms": round(percentile(samples_ms, 95), 3),
+        "p99_ms": round(percentile(samples_ms, 99), 3),
+        "max_ms": round(max(samples_ms), 3) if samples_ms else 0.0,
+        "throughput_rps": round(len(samples_ms) / duration_s, 2) if duration_s > 0 else 0.0,
+    }
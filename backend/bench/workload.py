@@ -0,0 +1,206 @@
+# backend/bench/workload.py
+"""
+Mixed-workload benchmark against a running server, usually after bench.seed.
+
+    python -m bench.workload --url http://localhost:8000 --clients 32 --duration 30 --out before.json
+
+Each client loops over a weighted mix of login, submission with an upload, admin listing,
+status updates, history paging and attachment fetches. The JSON report has p50/p95/p99 and
+throughput per operation and overall; compare two reports with bench.compare.
+"""
+import argparse
+import asyncio
+import os
+import platform
+import random
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+from bench.common import ensure_staff, git_revision, login, write_report
+from bench.stats import summarize
+
+DEFAULT_MIX = "login=1,submit=2,admin_list=3,status_update=2,history=3,attachment=3"
+STATUSES = ["Pending", "Approved", "Rejected", "Paid"]
+PROOF_BYTES = b"%PDF-1.4\n% bench upload\n" + b"0" * 4096 + b"\n%%EOF\n"
+
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise SystemExit(f"Unknown operation in --mix: {name!r}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+class Session:
+    """Shared state for all clients: tokens, known request IDs and attachment links."""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.admin_headers: dict = {}
+        self.staff: list = []  # (username, password, headers)
+        self.request_ids: list = []
+        self.proof_urls: list = []
+
+    def remember(self, items: list):
+        for item in items:
+            if item.get("request_id"):
+                self.request_ids.append(item["request_id"])
+            if item.get("proof_full_url"):
+                self.proof_urls.append(item["proof_full_url"])
+        # Keep the pools bounded on long runs
+        del self.request_ids[:-5000]
+        del self.proof_urls[:-5000]
+
+
+async def op_login(http, s: Session):
+    username, password, _ = s.rng.choice(s.staff)
+    return await http.post("/token", data={"username": username, "password": password})
+
+
+async def op_submit(http, s: Session):
+    _, _, headers = s.rng.choice(s.staff)
+    res = await http.post(
+        "/submit_payment",
+        data={"date": datetime.now(timezone.utc).strftime("%Y-%m-%d"), "purpose": "bench taxi", "amount": "12.50"},
+        files={"proof": ("receipt.pdf", PROOF_BYTES, "application/pdf")},
+        headers=headers,
+    )
+    if res.status_code == 200:
+        s.request_ids.append(res.json()["request_id"])
+    return res
+
+
+async def op_admin_list(http, s: Session):
+    res = await http.get("/admin/requests", headers=s.admin_headers)
+    if res.status_code == 200:
+        s.remember(res.json()[:50])
+    return res
+
+
+async def op_status_update(http, s: Session):
+    if not s.request_ids:
+        return None
+    req_id = s.rng.choice(s.request_ids)
+    return await http.patch(
+        f"/admin/requests/{req_id}", json={"status": s.rng.choice(STATUSES)}, headers=s.admin_headers
+    )
+
+
+async def op_history(http, s: Session):
+    _, _, headers = s.rng.choice(s.staff)
+    return await http.get("/history_requests", params={"limit": 50}, headers=headers)
+
+
+async def op_attachment(http, s: Session):
+    if not s.proof_urls:
+        return None
+    return await http.get(s.rng.choice(s.proof_urls))
+
+
+OPERATIONS = {
+    "login": op_login,
+    "submit": op_submit,
+    "admin_list": op_admin_list,
+    "status_update": op_status_update,
+    "history": op_history,
+    "attachment": op_attachment,
+}
+
+
+async def _client(http, s: Session, mix: dict, stop: asyncio.Event, record: asyncio.Event, samples: dict, errors: dict):
+    names, weights = list(mix), list(mix.values())
+    while not stop.is_set():
+        name = s.rng.choices(names, weights=weights)[0]
+        start = time.perf_counter()
+        try:
+            res = await OPERATIONS[name](http, s)
+        except httpx.HTTPError:
+            failed = True
+        else:
+            if res is None:
+                # Nothing to act on yet (e.g. no known request IDs); pick another operation
+                await asyncio.sleep(0)
+                continue
+            failed = res.status_code >= 400
+        if record.is_set():
+            samples[name].append((time.perf_counter() - start) * 1000)
+            errors[name] += failed
+
+
+async def _prepare(http, s: Session, args):
+    admin_token = await login(http, args.admin_user, args.admin_pass)
+    s.admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    for i in range(args.staff):
+        username = f"{args.staff_prefix}{i:05d}"
+        await ensure_staff(http, admin_token, username, args.staff_pass)
+        token = await login(http, username, args.staff_pass)
+        s.staff.append((username, args.staff_pass, {"Authorization": f"Bearer {token}"}))
+    # Seed the ID and attachment pools from existing data (bench.seed output or earlier runs)
+    res = await http.get("/history_requests", params={"limit": 500}, headers=s.admin_headers)
+    res.raise_for_status()
+    s.remember(res.json()["items"])
+
+
+async def main(args):
+    mix = parse_mix(args.mix)
+    s = Session(random.Random(args.seed))
+    limits = httpx.Limits(max_connections=args.clients + 4)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=limits) as http:
+        await _prepare(http, s, args)
+
+        samples = {name: [] for name in mix}
+        errors = {name: 0 for name in mix}
+        stop, record = asyncio.Event(), asyncio.Event()
+        clients = [
+            asyncio.create_task(_client(http, s, mix, stop, record, samples, errors))
+            for _ in range(args.clients)
+        ]
+        # Warm-up traffic fills caches and pools but is not recorded
+        await asyncio.sleep(args.warmup)
+        record.set()
+        await asyncio.sleep(args.duration)
+        stop.set()
+        await asyncio.gather(*clients)
+
+    all_samples = [v for values in samples.values() for v in values]
+    report = {
+        "meta": {
+            "url": args.url,
+            "label": args.label,
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "clients": args.clients,
+            "staff": args.staff,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "mix": mix,
+            "seed": args.seed,
+        },
+        "total": summarize(all_samples, args.duration, sum(errors.values())),
+        "operations": {name: summarize(samples[name], args.duration, errors[name]) for name in mix},
+    }
+    write_report(report, args.out)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mixed-workload latency and throughput benchmark")
+    parser.add_argument("--url", default=os.getenv("BENCH_URL", "http://localhost:8000"))
+    parser.add_argument("--admin-user", default="nou")
+    parser.add_argument("--admin-pass", default=os.getenv("ADMIN_PASS", "nou123"))
+    parser.add_argument("--staff", type=int, default=8, help="staff accounts the clients act as")
+    parser.add_argument("--staff-prefix", default="bench_user_", help="matches bench.seed's accounts")
+    parser.add_argument("--staff-pass", default=os.getenv("BENCH_PASS", "bench_pw"))
+    parser.add_argument("--clients", type=int, default=16, help="concurrent async clients")
+    parser.add_argument("--duration", type=float, default=30.0, help="recorded seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="unrecorded seconds before measuring")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation=weight pairs")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--label", default=None, help="free-form tag stored in the report")
+    parser.add_argument("--out", default=None, help="also write the JSON report to this file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,176 @@
+# backend/blobstore.py
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from db import archive_collection, blobs_collection, requests_collection
+from uploads import StagedUpload, remove_quietly, upload_path
+
+IMAGE_VARIANTS = ("thumb", "preview")
+# recount() leaves blobs referenced this recently alone: their request may not be visible to
+# its aggregation yet (the reference is taken right after the request is inserted)
+BLOB_RECOUNT_GRACE_SECONDS = int(os.getenv("BLOB_RECOUNT_GRACE_SECONDS", "3600"))
+
+
+class BlobStore:
+    """
+    Content-addressed attachment storage. Each distinct file is kept once, named by its
+    SHA-256 and sharded two levels deep (ab/cd/abcd...), so re-uploaded receipts share a
+    file and no single directory grows without bound. Every blob has a document in
+    blobs_collection whose refcount is the number of requests pointing at it.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def variant_path(self, sha256: str, variant: str) -> str:
+        # Derived images (see thumbnails.py) sit next to their blob and share its lifetime
+        return f"{self.path_for(sha256)}.{variant}.jpg"
+
+    async def put(self, staged: StagedUpload) -> str:
+        """Move a staged upload into the store (or drop it if the content exists) and take a reference."""
+        # Reference first: once refcount > 0, gc() will not take the existing file away
+        await self.add_ref(staged.sha256, staged.size)
+        try:
+            await run_in_threadpool(_place_file, staged.temp_path, self.path_for(staged.sha256))
+        except Exception:
+            await self.release(staged.sha256)
+            raise
+        return staged.sha256
+
+    async def put_many(self, staged: List[StagedUpload]) -> List[str]:
+        """put() for a batch: distinct blobs are placed concurrently, one reference update each."""
+        groups: Dict[str, List[StagedUpload]] = {}
+        for item in staged:
+            groups.setdefault(item.sha256, []).append(item)
+        await asyncio.gather(*(
+            self.add_ref(sha256, group[0].size, len(group)) for sha256, group in groups.items()
+        ))
+        try:
+            await asyncio.gather(*(
+                run_in_threadpool(_place_files, [item.temp_path for item in group], self.path_for(sha256))
+                for sha256, group in groups.items()
+            ))
+        except Exception:
+            await asyncio.gather(*(
+                self.add_ref(sha256, group[0].size, -len(group)) for sha256, group in groups.items()
+            ))
+            raise
+        return [item.sha256 for item in staged]
+
+    async def add_ref(self, sha256: str, size: int, count: int = 1):
+        now = datetime.now(timezone.utc)
+        await blobs_collection.update_one(
+            {"_id": sha256},
+            {
+                "$inc": {"refcount": count},
+                "$set": {"last_ref_at": now},
+                "$setOnInsert": {"size": size, "created_at": now},
+            },
+            upsert=True
+        )
+
+    async def release(self, sha256: str):
+        """Drop one reference; the file itself is only removed by gc()."""
+        await blobs_collection.update_one({"_id": sha256}, {"$inc": {"refcount": -1}})
+
+    def resolve(self, doc: dict) -> Optional[str]:
+        """Path of a request's proof file: the blob when migrated, else the legacy flat file."""
+        if doc.get("proof_blob"):
+            return self.path_for(doc["proof_blob"])
+        if doc.get("proof_filename"):
+            return os.path.join(upload_path, doc["proof_filename"])
+        return None
+
+    async def recount(self):
+        """
+        Rebuild every refcount from the live and archived requests with one aggregation each.
+        Safe against concurrent uploads: a count is only overwritten if it has not changed since
+        it was read and the blob was not referenced within BLOB_RECOUNT_GRACE_SECONDS.
+        """
+        # Taken before the aggregation, so it also covers references added while it runs
+        grace_cutoff = datetime.now(timezone.utc) - timedelta(seconds=BLOB_RECOUNT_GRACE_SECONDS)
+        pipeline = [
+            {"$match": {"proof_blob": {"$exists": True}}},
+            {"$group": {"_id": "$proof_blob", "count": {"$sum": 1}}},
+        ]
+        counts = {}
+        # Archived requests keep their proofs alive
+        for collection in (requests_collection, archive_collection):
+            async for row in collection.aggregate(pipeline):
+                counts[row["_id"]] = counts.get(row["_id"], 0) + row["count"]
+        async for blob in blobs_collection.find({}, {"refcount": 1}):
+            actual = counts.pop(blob["_id"], 0)
+            if blob.get("refcount") != actual:
+                await blobs_collection.update_one(
+                    {
+                        "_id": blob["_id"],
+                        "refcount": blob.get("refcount"),
+                        "last_ref_at": {"$not": {"$gte": grace_cutoff}},
+                    },
+                    {"$set": {"refcount": actual}}
+                )
+        for sha256, count in counts.items():
+            path = self.path_for(sha256)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            # Insert-only: a document an upload created meanwhile already has the right count
+            await blobs_collection.update_one(
+                {"_id": sha256},
+                {"$setOnInsert": {"refcount": count, "size": size, "created_at": datetime.now(timezone.utc)}},
+                upsert=True
+            )
+
+    async def gc(self) -> int:
+        """Delete blobs that no request references any more. Returns the number removed."""
+        removed = 0
+        async for blob in blobs_collection.find({"refcount": {"$lte": 0}}, {"_id": 1}):
+            path = self.path_for(blob["_id"])
+            trash = f"{path}.deleting"
+            # Move the file aside before dropping the document. An upload that references the
+            # blob meanwhile makes the delete fail and gets the file back; one that comes after
+            # the delete finds no file and places its own copy.
+            moved = await run_in_threadpool(_move_quietly, path, trash)
+            result = await blobs_collection.delete_one({"_id": blob["_id"], "refcount": {"$lte": 0}})
+            if not result.deleted_count:
+                if moved:
+                    # Same bytes as any copy an upload placed meanwhile, so overwriting is harmless
+                    await run_in_threadpool(os.replace, trash, path)
+                continue
+            await run_in_threadpool(remove_quietly, trash)
+            for variant in IMAGE_VARIANTS:
+                await run_in_threadpool(remove_quietly, self.variant_path(blob["_id"], variant))
+            removed += 1
+        return removed
+
+
+def _place_file(temp_path: str, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        # Same hash means same bytes: keep the existing copy
+        remove_quietly(temp_path)
+    else:
+        os.replace(temp_path, path)
+
+
+def _move_quietly(src: str, dst: str) -> bool:
+    try:
+        os.replace(src, dst)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _place_files(temp_paths: List[str], path: str):
+    # Identical uploads in one batch: the first copy becomes the blob, the rest are dropped
+    for temp_path in temp_paths:
+        _place_file(temp_path, path)
+
+
+blob_store = BlobStore(os.path.join(upload_path, "blobs"))
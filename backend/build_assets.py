@@ -0,0 +1,83 @@
+# backend/build_assets.py
+# Builds content-hashed, precompressed copies of the static assets index.html references via
+# static_url('...'): frontend/static/dist/<name>.<hash>.<ext> plus .gz (and .br when brotli is
+# installed), with the mapping in dist/manifest.json. The app resolves static_url() through the
+# manifest at startup and serves dist/ as immutable; without a build it falls back to the plain
+# /static/ files. Re-run after editing any asset (python build_assets.py), then restart the app.
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+
+from compression import ASSET_DIST_DIR, brotli
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+static_dir = os.path.join(project_root, "frontend", "static")
+template_path = os.path.join(project_root, "frontend", "templates", "index.html")
+dist_dir = os.path.join(static_dir, ASSET_DIST_DIR)
+manifest_path = os.path.join(dist_dir, "manifest.json")
+
+REFERENCE = re.compile(r"""static_url\(\s*['"]([^'"]+)['"]\s*\)""")
+# Images are already compressed; precompressing them only wastes disk
+PRECOMPRESS_EXTS = {".css", ".js", ".svg", ".json", ".txt", ".html"}
+HASH_LENGTH = 12
+
+
+def referenced_assets() -> list:
+    with open(template_path, encoding="utf-8") as f:
+        return sorted(set(REFERENCE.findall(f.read())))
+
+
+def _write(path: str, data: bytes):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def build_asset(name: str) -> dict:
+    with open(os.path.join(static_dir, name), "rb") as f:
+        data = f.read()
+    stem, ext = os.path.splitext(name)
+    hashed = f"{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}"
+    target = os.path.join(dist_dir, hashed)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    _write(target, data)
+
+    sizes = {"raw": len(data)}
+    if ext in PRECOMPRESS_EXTS:
+        # mtime=0 keeps the .gz byte-identical across builds of the same content
+        variants = {"gz": gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants["br"] = brotli.compress(data, quality=11)
+        for suffix, encoded in variants.items():
+            # Only keep a variant that is actually smaller
+            if len(encoded) < len(data):
+                _write(f"{target}.{suffix}", encoded)
+                sizes[suffix] = len(encoded)
+    return {"path": f"{ASSET_DIST_DIR}/{hashed}", "sizes": sizes}
+
+
+def main():
+    names = referenced_assets()
+    if not names:
+        raise SystemExit(f"No static_url('...') references found in {template_path}")
+    # Start clean so outdated hashed files do not pile up
+    shutil.rmtree(dist_dir, ignore_errors=True)
+    os.makedirs(dist_dir)
+
+    manifest = {}
+    for name in names:
+        built = build_asset(name)
+        manifest[name] = built["path"]
+        sizes = ", ".join(f"{k} {v}" for k, v in built["sizes"].items())
+        print(f"  {name:<20} -> {built['path']} ({sizes} bytes)")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    if brotli is None:
+        print("⚠️ brotli not installed; only .gz variants were written")
+    print(f"✅ Built {len(manifest)} asset(s) into {dist_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# backend/cache.py
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Small in-process LRU cache where every entry also expires after a TTL.
+    Not shared between uvicorn workers; the TTL bounds how stale a worker can get.
+    With max_bytes, `sizeof(value)` is also kept under that budget.
+    """
+
+    def __init__(
+        self, maxsize: int = 1024, ttl: float = 60.0,
+        max_bytes: Optional[int] = None, sizeof: Callable[[Any], int] = len,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            # Expired entries count as a miss and are dropped right away
+            self._remove(key)
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._remove(key)
+        self._data[key] = (value, time.monotonic() + ttl, size)
+        self.bytes += size
+        while len(self._data) > self.maxsize or (self.max_bytes is not None and self.bytes > self.max_bytes):
+            _, (_, _, evicted_size) = self._data.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+    def pop(self, key: Hashable) -> None:
+        self._remove(key)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        stats = {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+        if self.max_bytes is not None:
+            stats.update(bytes=self.bytes, max_bytes=self.max_bytes)
+        return stats
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    version: int
+
+
+class ResponseCache:
+    """
+    Rendered response bodies keyed by endpoint and filters, each stamped with the data
+    version it was built from. An entry is only served while that version is current, so a
+    write that bumps the version retires every entry at once without having to find them.
+    `backend` needs get/set/stats like TTLCache; a shared store (e.g. Redis) exposing the
+    same three methods lets all workers reuse each other's renders.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def get(self, key: Hashable, version: int) -> Optional[CachedResponse]:
+        entry = self.backend.get(key)
+        if entry is not None and entry.version == version:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        if entry is not None:
+            self.stale += 1
+        return None
+
+    def put(self, key: Hashable, version: int, body: bytes) -> CachedResponse:
+        # Strong ETag from the bytes themselves: an unchanged rebuild still revalidates as 304
+        entry = CachedResponse(body, f'"{hashlib.sha1(body).hexdigest()}"', version)
+        self.backend.set(key, entry)
+        return entry
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            **self.backend.stats(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
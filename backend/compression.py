@@ -0,0 +1,179 @@
+# backend/compression.py
+import mimetypes
+import os
+import zlib
+from typing import Dict, Optional, Tuple
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it responses are only gzip-compressed
+    brotli = None
+
+# Bodies smaller than this are sent as-is: the framing overhead outweighs the saving
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+# Per-request brotli favours speed; build_assets.py uses the maximum quality offline
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+# Event streams are deliberately absent: compressors buffer, which would delay events
+COMPRESSIBLE_TYPES = (
+    "application/json", "application/x-ndjson", "application/javascript",
+    "text/csv", "text/html", "text/plain", "text/css", "text/javascript",
+)
+# Content-hashed output of build_assets.py, relative to the static directory
+ASSET_DIST_DIR = "dist"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Accept-Encoding as {coding: q}; codings with q=0 are refused."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name.strip():
+            accepted[name.strip()] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: str, available: Tuple[str, ...]) -> Optional[str]:
+    """The coding of `available` with the highest q; ties go to the earlier (preferred) one."""
+    accepted = accepted_encodings(accept_encoding)
+    q, _, coding = max((accepted.get(c, accepted.get("*", 0.0)), -i, c) for i, c in enumerate(available))
+    return coding if q > 0 else None
+
+
+def _is_compressible(headers: MutableHeaders) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    return content_type in COMPRESSIBLE_TYPES
+
+
+class _Encoder:
+    def __init__(self, coding: str):
+        if coding == "br":
+            compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._compress, self._sync, self._end = compressor.process, compressor.flush, compressor.finish
+        else:
+            compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._compress, self._end = compressor.compress, compressor.flush
+            self._sync = lambda: compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def chunk(self, data: bytes) -> bytes:
+        # Flushed per chunk so streamed exports still arrive progressively
+        return self._compress(data) + self._sync()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compress(data) + self._end()
+
+
+class _CompressingSend:
+    """Wraps `send` for one response: holds the start message, and body chunks up to minimum_size,
+    until it is clear whether compressing is worthwhile."""
+
+    def __init__(self, send, coding: str, minimum_size: int):
+        self.send = send
+        self.coding = coding
+        self.minimum_size = minimum_size
+        self.start = None
+        self.pending = b""
+        self.encoder = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            return await self.send(message)
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+        if self.encoder is not None:
+            data = self.encoder.chunk(body) if more_body else self.encoder.finish(body)
+            return await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        if not _is_compressible(headers):
+            self.passthrough = True
+            await self.send(self.start)
+            return await self.send(message)
+        # Responses can arrive in several chunks (streamed, or re-streamed by http middleware),
+        # so the size threshold applies to what has accumulated, not to a single chunk
+        self.pending += body
+        if more_body and len(self.pending) < self.minimum_size:
+            return
+        headers.add_vary_header("Accept-Encoding")
+        if len(self.pending) < self.minimum_size:
+            self.passthrough = True
+            await self.send(self.start)
+            return await self.send({"type": "http.response.body", "body": self.pending})
+
+        self.encoder = _Encoder(self.coding)
+        headers["Content-Encoding"] = self.coding
+        # The encoded bytes are a different representation of the same resource
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        if more_body:
+            del headers["Content-Length"]
+            data = self.encoder.chunk(self.pending)
+        else:
+            data = self.encoder.finish(self.pending)
+            headers["Content-Length"] = str(len(data))
+        self.pending = b""
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware: br (when installed) or gzip for text-like responses above minimum_size."""
+
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.available = ("br", "gzip") if brotli is not None else ("gzip",)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        coding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), self.available)
+        if coding is None:
+            return await self.app(scope, receive, send)
+        await self.app(scope, receive, _CompressingSend(send, coding, self.minimum_size))
+
+
+class AssetStaticFiles(StaticFiles):
+    """StaticFiles that serves the hashed files under dist/ precompressed and cacheable forever."""
+
+    async def get_response(self, path: str, scope):
+        if not path.startswith(ASSET_DIST_DIR + os.sep):
+            return await super().get_response(path, scope)
+
+        response = None
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        for candidate, suffix in PRECOMPRESSED:
+            if choose_encoding(accept_encoding, (candidate,)) is None:
+                continue
+            full_path, stat_result = self.lookup_path(path + suffix)
+            if stat_result is None:
+                continue
+            response = self.file_response(full_path, stat_result, scope)
+            if response.status_code == 200:
+                response.headers["Content-Type"] = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            response.headers["Content-Encoding"] = candidate
+            break
+        if response is None:
+            response = await super().get_response(path, scope)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        response.headers.add_vary_header("Accept-Encoding")
+        return response
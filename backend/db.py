@@ -1,13 +1,31 @@
 # backend/db.py
 from dotenv import load_dotenv
 import os
+import asyncio
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo.errors import ConnectionFailure
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from metrics import mongo_listeners
 
 load_dotenv()
 
 MONGO_URI = os.getenv("MONGO_URI")
 DB_NAME = os.getenv("DB_NAME")
+# Request IDs reserved per worker per counter round trip; REQUEST_ID_GAPLESS=1 disables blocks
+REQUEST_ID_BLOCK_SIZE = int(os.getenv("REQUEST_ID_BLOCK_SIZE", "20"))
+REQUEST_ID_GAPLESS = os.getenv("REQUEST_ID_GAPLESS", "0").lower() in ("1", "true", "yes")
+# Paid requests older than this (by paid and created date) move to requests_archive
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
+ARCHIVE_BATCH_SIZE = 1000
+# Connection pool per process. Admission control (admission.py) keeps uploads and unpaged
+# reads below this, so cheap requests still find a free connection under load.
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "20"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "1"))
+# Optional cap on how long a request waits for a pooled connection; unset waits indefinitely
+MONGO_WAIT_QUEUE_TIMEOUT_MS = os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS")
 
 if not MONGO_URI or not DB_NAME:
     raise RuntimeError("Missing MONGO_URI or DB_NAME in .env")
@@ -15,8 +33,10 @@ if not MONGO_URI or not DB_NAME:
 client = AsyncIOMotorClient(
     MONGO_URI,
     serverSelectionTimeoutMS=5000,
-    maxPoolSize=20,
-    minPoolSize=1
+    maxPoolSize=MONGO_MAX_POOL_SIZE,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+    waitQueueTimeoutMS=int(MONGO_WAIT_QUEUE_TIMEOUT_MS) if MONGO_WAIT_QUEUE_TIMEOUT_MS else None,
+    event_listeners=mongo_listeners()  # Per-command latency and pool wait times for /metrics
 )
 
 db = client[DB_NAME]
@@ -24,22 +44,69 @@ db = client[DB_NAME]
 users_collection = db["users"]
 requests_collection = db["requests"]
 counters_collection = db["counters"] # NEW: Collection for sequences
+summaries_collection = db["request_summaries"] # Per-month request counts by type and status
+blobs_collection = db["blobs"] # Content-addressed attachment files and their refcounts
+rollups_collection = db["spend_rollups"] # Count/amount per (month, staffName, type, status)
+archive_collection = db["requests_archive"] # Old Paid requests moved out of requests_collection
 
 # --- Request ID Sequence Logic ---
 
-async def get_next_sequence_value(sequence_name: str) -> int:
+class SequenceAllocator:
     """
-    Atomically increments and returns the next sequence value for a given sequence name.
+    Hi/lo allocator on top of a counter document. Each worker reserves a block of values
+    with one $inc and hands them out locally, so submissions do not all queue on the
+    counter document. Values stay unique across workers because every block is reserved
+    atomically; unused values in a block are skipped when the worker restarts.
+    With gapless=True each value costs its own $inc and the sequence has no holes.
     """
-    # Use find_one_and_update with $inc to atomically increment the counter
-    result = await counters_collection.find_one_and_update(
-        {"_id": sequence_name},
-        {"$inc": {"sequence_value": 1}},
-        upsert=True,  # Creates the document if it doesn't exist
-        return_document=True  # Returns the updated document
-    )
-    # The result structure from find_one_and_update is a full document.
-    return result["sequence_value"]
+
+    def __init__(self, sequence_name: str, block_size: int = 20, gapless: bool = False):
+        self.sequence_name = sequence_name
+        self.block_size = 0 if gapless else max(block_size - 1, 0)
+        # Empty local block until the first reservation
+        self._next = 1
+        self._high = 0
+        self._lock = asyncio.Lock()
+
+    async def _reserve(self, size: int) -> int:
+        # Returns the last value of a freshly reserved range of `size` values
+        result = await counters_collection.find_one_and_update(
+            {"_id": self.sequence_name},
+            {"$inc": {"sequence_value": size}},
+            upsert=True,
+            return_document=True
+        )
+        return result["sequence_value"]
+
+    async def take(self, count: int = 1) -> List[int]:
+        async with self._lock:
+            values = []
+            while self._next <= self._high and len(values) < count:
+                values.append(self._next)
+                self._next += 1
+            missing = count - len(values)
+            if missing:
+                # One round trip covers this call plus the next block for later calls
+                size = missing + self.block_size
+                high = await self._reserve(size)
+                start = high - size + 1
+                values.extend(range(start, start + missing))
+                self._next = start + missing
+                self._high = high
+            return values
+
+    async def next(self) -> int:
+        return (await self.take(1))[0]
+
+
+request_id_allocator = SequenceAllocator("request_id", REQUEST_ID_BLOCK_SIZE, REQUEST_ID_GAPLESS)
+
+def format_request_id(seq: int) -> str:
+    # PR0001 ... PR9999, then widens naturally to PR10000
+    return f"PR{seq:04d}"
+
+async def next_request_ids(count: int = 1) -> List[str]:
+    return [format_request_id(v) for v in await request_id_allocator.take(count)]
 
 async def init_counters():
     """
@@ -55,27 +122,420 @@ async def init_counters():
         print("✅ Request ID counter already exists.")
 
 
+# --- Data Version ---
+# A counter every request write bumps after it lands. Response caches stamp entries with the
+# version they were built from (read before querying), so any newer write retires them.
+# Kept in MongoDB rather than in-process so a write in one worker is seen by all of them.
+
+async def bump_data_version():
+    await counters_collection.update_one({"_id": "requests_version"}, {"$inc": {"value": 1}}, upsert=True)
+
+async def get_data_version() -> int:
+    doc = await counters_collection.find_one({"_id": "requests_version"})
+    return doc["value"] if doc else 0
+
+# The same idea for accounts: user writes bump it, and every worker's user cache drops
+# entries stamped with an older value (see get_cached_user in main.py)
+async def bump_users_version():
+    await counters_collection.update_one({"_id": "users_version"}, {"$inc": {"value": 1}}, upsert=True)
+
+async def get_users_version() -> int:
+    doc = await counters_collection.find_one({"_id": "users_version"})
+    return doc["value"] if doc else 0
+
+
+# --- Request Summary Counters ---
+# One document per month ({"_id": "2025-01", "counts": {"payment": {"Pending": 3, ...}, ...}}),
+# keyed by the month the request was created in. Writers keep it in step with $inc so that
+# dashboard counts are a single primary-key read.
+
+def month_key(created_at: datetime) -> str:
+    return created_at.strftime("%Y-%m")
+
+async def bump_request_summary(created_at: datetime, req_type: str, status: str, delta: int = 1):
+    await summaries_collection.update_one(
+        {"_id": month_key(created_at)},
+        {"$inc": {f"counts.{req_type}.{status}": delta}},
+        upsert=True
+    )
+
+async def move_request_summary(created_at: datetime, req_type: str, old_status: str, new_status: str):
+    if old_status == new_status:
+        return
+    await summaries_collection.update_one(
+        {"_id": month_key(created_at)},
+        {"$inc": {
+            f"counts.{req_type}.{old_status}": -1,
+            f"counts.{req_type}.{new_status}": 1,
+        }},
+        upsert=True
+    )
+
+async def move_request_summaries(moves: List[tuple]):
+    """Batched move_request_summary: `moves` is a list of (created_at, type, old_status, new_status)."""
+    per_month = {}
+    for created_at, req_type, old_status, new_status in moves:
+        if old_status == new_status:
+            continue
+        inc = per_month.setdefault(month_key(created_at), {})
+        inc[f"counts.{req_type}.{old_status}"] = inc.get(f"counts.{req_type}.{old_status}", 0) - 1
+        inc[f"counts.{req_type}.{new_status}"] = inc.get(f"counts.{req_type}.{new_status}", 0) + 1
+    if per_month:
+        await summaries_collection.bulk_write(
+            [UpdateOne({"_id": month}, {"$inc": inc}, upsert=True) for month, inc in per_month.items()],
+            ordered=False
+        )
+
+async def bump_request_summaries(docs: List[dict]):
+    """Batched bump_request_summary for newly inserted requests: one $inc per month."""
+    per_month = {}
+    for doc in docs:
+        inc = per_month.setdefault(month_key(doc["created_at"]), {})
+        field = f"counts.{doc['type']}.{doc['status']}"
+        inc[field] = inc.get(field, 0) + 1
+    if per_month:
+        await summaries_collection.bulk_write(
+            [UpdateOne({"_id": month}, {"$inc": inc}, upsert=True) for month, inc in per_month.items()],
+            ordered=False
+        )
+
+async def get_request_summary(created_at: datetime) -> dict:
+    doc = await summaries_collection.find_one({"_id": month_key(created_at)})
+    return (doc or {}).get("counts", {})
+
+async def recompute_request_summaries():
+    """
+    Rebuild every summary document from the live and archived requests with one aggregation each.
+    Use this to recover from drift (e.g. a crash between an insert and its $inc).
+    """
+    pipeline = [
+        {"$group": {
+            "_id": {
+                "month": {"$dateToString": {"format": "%Y-%m", "date": "$created_at"}},
+                "type": "$type",
+                "status": "$status",
+            },
+            "count": {"$sum": 1},
+        }},
+    ]
+    # Months present before the rebuild; only these can be stale, a month a live insert
+    # creates meanwhile is left alone
+    existing = set(await summaries_collection.distinct("_id"))
+    summaries = {}
+    # Archived requests still count towards their month
+    for collection in (requests_collection, archive_collection):
+        async for row in collection.aggregate(pipeline):
+            key = row["_id"]
+            if not key.get("month") or not key.get("type") or not key.get("status"):
+                continue
+            counts = summaries.setdefault(key["month"], {}).setdefault(key["type"], {})
+            counts[key["status"]] = counts.get(key["status"], 0) + row["count"]
+
+    # Replace month by month instead of delete-then-insert: concurrent $inc upserts never find
+    # the collection empty, so they cannot collide with the rebuild or lose a month
+    if summaries:
+        await summaries_collection.bulk_write(
+            [ReplaceOne({"_id": month}, {"counts": counts}, upsert=True) for month, counts in summaries.items()],
+            ordered=False
+        )
+    stale = existing - set(summaries)
+    if stale:
+        await summaries_collection.delete_many({"_id": {"$in": list(stale)}})
+    print(f"✅ Rebuilt request summaries for {len(summaries)} month(s)")
+
+async def init_request_summaries():
+    # First boot after this feature ships: seed counters from existing requests
+    if await summaries_collection.estimated_document_count() == 0:
+        await recompute_request_summaries()
+
+
+# --- Spend Rollups ---
+# One document per (month, staffName, type, status) with the number of requests and their
+# summed amount, keyed by the month the request was created in. Submissions add to the
+# Pending bucket; status changes move count and amount from the old bucket to the new one.
+
+def _rollup_key(doc: dict, status: str) -> dict:
+    return {
+        "month": month_key(doc["created_at"]),
+        "staffName": doc.get("staffName"),
+        "type": doc.get("type"),
+        "status": status,
+    }
+
+def _rollup_key_fields(doc: dict):
+    # (field, value) pairs in the bucket index order, whatever order the source document has
+    return ((field, doc.get(field)) for field in ("month", "staffName", "type", "status"))
+
+async def bump_spend_rollup(doc: dict):
+    await rollups_collection.update_one(
+        _rollup_key(doc, doc["status"]),
+        {"$inc": {"count": 1, "amount": doc.get("amount", 0)}},
+        upsert=True
+    )
+
+async def bump_spend_rollups(docs: List[dict]):
+    """Batched bump_spend_rollup: one upsert per distinct bucket."""
+    deltas = {}
+    for doc in docs:
+        key = tuple(_rollup_key(doc, doc["status"]).items())
+        count, amount = deltas.get(key, (0, 0))
+        deltas[key] = (count + 1, amount + doc.get("amount", 0))
+    if deltas:
+        await rollups_collection.bulk_write(
+            [
+                UpdateOne(dict(key), {"$inc": {"count": count, "amount": amount}}, upsert=True)
+                for key, (count, amount) in deltas.items()
+            ],
+            ordered=False
+        )
+
+async def move_spend_rollups(moves: List[tuple]):
+    """`moves` is a list of (request_doc_before_update, new_status)."""
+    deltas = {}
+    for doc, new_status in moves:
+        old_status = doc.get("status")
+        if old_status == new_status or not doc.get("created_at"):
+            continue
+        amount = doc.get("amount", 0)
+        for status, sign in ((old_status, -1), (new_status, 1)):
+            key = tuple(_rollup_key(doc, status).items())
+            count_delta, amount_delta = deltas.get(key, (0, 0))
+            deltas[key] = (count_delta + sign, amount_delta + sign * amount)
+    if deltas:
+        await rollups_collection.bulk_write(
+            [
+                UpdateOne(dict(key), {"$inc": {"count": count, "amount": amount}}, upsert=True)
+                for key, (count, amount) in deltas.items()
+            ],
+            ordered=False
+        )
+
+async def recompute_spend_rollups():
+    """Rebuild all rollups from the live and archived requests with one aggregation each."""
+    pipeline = [
+        {"$match": {"created_at": {"$type": "date"}}},
+        {"$group": {
+            "_id": {
+                "month": {"$dateToString": {"format": "%Y-%m", "date": "$created_at"}},
+                "staffName": "$staffName",
+                "type": "$type",
+                "status": "$status",
+            },
+            "count": {"$sum": 1},
+            "amount": {"$sum": "$amount"},
+        }},
+    ]
+    # Buckets present before the rebuild; only these can be stale
+    existing = {
+        doc["_id"]: tuple(_rollup_key_fields(doc))
+        async for doc in rollups_collection.find({}, {"month": 1, "staffName": 1, "type": 1, "status": 1})
+    }
+    totals = {}
+    for collection in (requests_collection, archive_collection):
+        async for row in collection.aggregate(pipeline):
+            key = tuple(_rollup_key_fields(row["_id"]))
+            count, amount = totals.get(key, (0, 0))
+            totals[key] = (count + row["count"], amount + row["amount"])
+    # Replace bucket by bucket instead of delete-then-insert, so concurrent $inc upserts never
+    # collide with the rebuild on the unique bucket index
+    if totals:
+        await rollups_collection.bulk_write(
+            [
+                ReplaceOne(dict(key), {**dict(key), "count": count, "amount": amount}, upsert=True)
+                for key, (count, amount) in totals.items()
+            ],
+            ordered=False
+        )
+    stale = [oid for oid, key in existing.items() if key not in totals]
+    if stale:
+        await rollups_collection.delete_many({"_id": {"$in": stale}})
+    print(f"✅ Rebuilt {len(totals)} spend rollup row(s)")
+
+async def init_spend_rollups():
+    # First boot after this feature ships: seed rollups from existing requests
+    if await rollups_collection.estimated_document_count() == 0:
+        await recompute_spend_rollups()
+
+
+# --- Archive ---
+# Paid requests past ARCHIVE_AFTER_DAYS move to requests_archive so the live collection and
+# its indexes only hold the working set. The archive keeps the documents unchanged (same _id),
+# so keyset cursors stay valid across both. The "archive" counters document holds the cutoff: every archived
+# request was created and paid before it, which tells readers when the archive can matter.
+
+async def get_archive_cutoff() -> Optional[datetime]:
+    doc = await counters_collection.find_one({"_id": "archive"})
+    return doc.get("cutoff") if doc else None
+
+async def archive_paid_requests(cutoff: Optional[datetime] = None, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """
+    Move Paid requests created and paid before `cutoff` into the archive. Returns the number moved.
+    Safe to re-run or interrupt: documents are copied before they are deleted, and a copy left
+    over from an interrupted run is simply skipped.
+    """
+    if cutoff is None:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=ARCHIVE_AFTER_DAYS)
+    # Publish the cutoff before moving anything, so readers never skip the archive for a
+    # range it already holds documents in
+    await counters_collection.update_one({"_id": "archive"}, {"$max": {"cutoff": cutoff}}, upsert=True)
+
+    query = {"status": "Paid", "paid_date": {"$lt": cutoff}, "created_at": {"$lt": cutoff}}
+    moved = 0
+    while True:
+        docs = await requests_collection.find(query).sort("_id", 1).to_list(batch_size)
+        if not docs:
+            break
+        try:
+            await archive_collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            # Duplicate keys are copies from an earlier interrupted run; anything else is real
+            if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                raise
+        result = await requests_collection.delete_many({"_id": {"$in": [d["_id"] for d in docs]}})
+        moved += result.deleted_count
+    if moved:
+        await bump_data_version()
+    print(f"✅ Archived {moved} paid request(s) older than {cutoff:%Y-%m-%d}")
+    return moved
+
 # --- Main Index Initialization ---
+# Indexes from earlier releases that a compound index above now covers; dropping them
+# saves their write and memory cost
+SUPERSEDED_INDEXES = {
+    "requests": ["staffName_1", "type_1", "created_at_-1", "status_1_paid_date_-1__id_-1"],
+    "spend_rollups": ["status_1_month_1"],
+}
 
-async def init_indexes():
-    try:
-        await client.admin.command("ping")
-        print("✅ MongoDB ping OK")
-    except ConnectionFailure as e:
-        print("MongoDB connection failed:", e)
+async def drop_superseded_indexes():
+    for collection in (requests_collection, rollups_collection):
+        existing = await collection.index_information()
+        for name in SUPERSEDED_INDEXES.get(collection.name, []):
+            if name in existing:
+                try:
+                    await collection.drop_index(name)
+                    print(f"✅ Dropped superseded index {collection.name}.{name}")
+                except OperationFailure:
+                    # Another worker dropped it first
+                    pass
 
-    # Indexes
+async def init_indexes():
+    # Indexes: one per query shape in main.py; bench/explain_check.py verifies that every
+    # endpoint query is served by one of them without a collection scan or in-memory sort
     await users_collection.create_index("username", unique=True)
-    await requests_collection.create_index("staffName")
-    await requests_collection.create_index("type")
-    await requests_collection.create_index([("created_at", -1)])
+    # Staff views (/my_requests, /history_requests, /search_requests, /export_requests):
+    # staffName equality, newest first, _id as the keyset tie-breaker
+    await requests_collection.create_index([("staffName", 1), ("created_at", -1), ("_id", -1)])
+    # Admin views of the same endpoints, without a staffName filter
+    await requests_collection.create_index([("created_at", -1), ("_id", -1)])
+    # /admin/requests: this month's non-Paid requests, optionally of one type. Status is in the
+    # key, so Paid rows are skipped in the index instead of being fetched and discarded
+    await requests_collection.create_index([("type", 1), ("created_at", -1), ("status", 1)])
+    await requests_collection.create_index([("created_at", -1), ("status", 1)])
+    # /admin/paid_records and paid_date exports: only Paid requests have a paid_date
+    await requests_collection.create_index(
+        [("paid_date", -1), ("_id", -1)],
+        name="paid_date_paid_only",
+        partialFilterExpression={"status": "Paid"}
+    )
+    # /attachments/{filename} looks requests up by their proof file name
+    await requests_collection.create_index("proof_filename")
+    # /search_requests: request_id lookups and prefix scans, and full-text search
+    await requests_collection.create_index("request_id")
+    await requests_collection.create_index(
+        [("description", "text"), ("purpose", "text"), ("staffName", "text")],
+        name="request_search_text",
+        weights={"description": 5, "purpose": 5, "staffName": 1}
+    )
+    # Spend rollups: unique bucket key for upserts; status equality then the report's sort order
+    await rollups_collection.create_index(
+        [("month", 1), ("staffName", 1), ("type", 1), ("status", 1)], unique=True
+    )
+    await rollups_collection.create_index([("status", 1), ("month", 1), ("staffName", 1), ("type", 1)])
+    await drop_superseded_indexes()
+    # Archive: the keyset orders the history and export endpoints read it with, plus attachment lookups
+    await archive_collection.create_index([("created_at", -1), ("_id", -1)])
+    await archive_collection.create_index([("staffName", 1), ("created_at", -1), ("_id", -1)])
+    await archive_collection.create_index([("paid_date", -1), ("_id", -1)])
+    await archive_collection.create_index("proof_filename")
+    # /search_requests reads the archive too; same text weights, so scores rank together
+    await archive_collection.create_index("request_id")
+    await archive_collection.create_index(
+        [("description", "text"), ("purpose", "text"), ("staffName", "text")],
+        name="request_search_text",
+        weights={"description": 5, "purpose": 5, "staffName": 1}
+    )
     
     # NEW: Initialize the request ID counter
     await init_counters()
+    await init_request_summaries()
+    await init_spend_rollups()
+
+
+# --- Bootstrap ---
+# Bump SCHEMA_VERSION whenever init_indexes (or anything it seeds) changes. On boot one worker
+# takes the bootstrap lock and runs init_indexes if the stored version is older; every other
+# worker, and every later boot of the same version, skips setup entirely.
+SCHEMA_VERSION = 6
+BOOTSTRAP_LOCK_SECONDS = 300  # A crashed holder's lock expires after this
+
+async def bootstrap() -> str:
+    """Run schema setup at most once per SCHEMA_VERSION. Returns 'current', 'ran' or 'locked'."""
+    schema = await counters_collection.find_one({"_id": "schema"})
+    if schema and schema.get("version", 0) >= SCHEMA_VERSION:
+        return "current"
+
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    now = datetime.now(timezone.utc)
+    try:
+        # Matches only a free or expired lock; otherwise the upsert collides on _id
+        await counters_collection.update_one(
+            {"_id": "schema_lock", "expires_at": {"$lt": now}},
+            {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=BOOTSTRAP_LOCK_SECONDS)}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # Another worker is setting up; serving does not depend on it finishing
+        return "locked"
+
+    try:
+        # Re-check: the previous holder may have finished between our read and the lock
+        schema = await counters_collection.find_one({"_id": "schema"})
+        if schema and schema.get("version", 0) >= SCHEMA_VERSION:
+            return "current"
+        await init_indexes()
+        await counters_collection.update_one(
+            {"_id": "schema"},
+            {"$set": {"version": SCHEMA_VERSION, "applied_at": datetime.now(timezone.utc), "applied_by": owner}},
+            upsert=True
+        )
+        print(f"✅ Schema version {SCHEMA_VERSION} applied")
+        return "ran"
+    finally:
+        await counters_collection.delete_one({"_id": "schema_lock", "owner": owner})
+
+
     # --- Utility: Clear all data (for reset/testing) ---
+async def clear_request_data():
+    """
+    Delete requests (live and archived) and their summaries and rollups, but keep users, blobs
+    and counters. The request ID sequence keeps counting, so a running server's reserved ID
+    block cannot collide with new IDs, and its accounts (the default admin included) stay valid.
+    """
+    await requests_collection.delete_many({})
+    await archive_collection.delete_many({})
+    await summaries_collection.delete_many({})
+    await rollups_collection.delete_many({})
+    # Running workers drop cached responses built from the old data
+    await bump_data_version()
+    print("✅ Cleared requests, archive, summaries and rollups (users, blobs and counters kept)")
+
 async def clear_all_data():
-    """Delete all documents from users, requests, and counters collections."""
+    """Delete all documents from users, requests, counters, summaries, blobs, rollups, and archive collections."""
     await users_collection.delete_many({})
     await requests_collection.delete_many({})
     await counters_collection.delete_many({})
-    print("✅ Cleared all data from users, requests, and counters collections")
\ No newline at end of file
+    await summaries_collection.delete_many({})
+    await blobs_collection.delete_many({})
+    await rollups_collection.delete_many({})
+    await archive_collection.delete_many({})
+    print("✅ Cleared all data from users, requests, counters, summaries, blobs, rollups, and archive collections")
\ No newline at end of file
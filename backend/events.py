@@ -0,0 +1,143 @@
+# backend/events.py
+import asyncio
+import json
+import os
+from typing import Any, Dict, Optional, Set
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+# Feed the hub from a MongoDB change stream instead of local publishes (needs a replica set).
+# With several uvicorn workers this is what lets every worker see every write.
+EVENTS_CHANGE_STREAM = os.getenv("EVENTS_CHANGE_STREAM", "0").lower() in ("1", "true", "yes")
+EVENT_QUEUE_SIZE = 100
+HEARTBEAT_SECONDS = 15
+# Reconnect backoff for the change stream after errors (failover, network blips)
+CHANGE_STREAM_RETRY_MIN_SECONDS = 1.0
+CHANGE_STREAM_RETRY_MAX_SECONDS = 30.0
+# The resume token fell out of the oplog: resuming is impossible, only a fresh stream is
+CHANGE_STREAM_HISTORY_LOST = 286
+
+
+class Subscriber:
+    def __init__(self, username: str, role: str):
+        self.username = username
+        self.role = role
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+
+    def wants(self, staff_name: Optional[str]) -> bool:
+        # Admins see everything, staff only their own requests
+        return self.role == "admin" or self.username == staff_name
+
+    def offer(self, event: Dict[str, Any]):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A client this far behind cannot apply deltas any more; tell it to reload instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"event": "resync", "data": {}})
+
+
+class EventHub:
+    """In-process pub/sub: request writes publish here, each /events connection subscribes."""
+
+    def __init__(self):
+        self.subscribers: Set[Subscriber] = set()
+        self.published = 0
+        self.stream_errors = 0
+
+    def subscribe(self, username: str, role: str) -> Subscriber:
+        sub = Subscriber(username, role)
+        self.subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        self.subscribers.discard(sub)
+
+    def publish(self, event: str, data: Dict[str, Any], staff_name: Optional[str]):
+        self.published += 1
+        for sub in list(self.subscribers):
+            if sub.wants(staff_name):
+                sub.offer({"event": event, "data": data})
+
+    def resync(self):
+        """Tell every subscriber to reload, e.g. after events may have been missed."""
+        for sub in list(self.subscribers):
+            sub.offer({"event": "resync", "data": {}})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self.subscribers),
+            "published": self.published,
+            "source": "change_stream" if EVENTS_CHANGE_STREAM else "local",
+            "stream_errors": self.stream_errors,
+        }
+
+
+hub = EventHub()
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def sse_stream(sub: Subscriber, is_disconnected):
+    """Yield SSE frames for one subscriber, with heartbeats so proxies keep the connection open."""
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                item = await asyncio.wait_for(sub.queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    break
+                yield ": ping\n\n"
+                continue
+            yield format_sse(item["event"], item["data"])
+    finally:
+        hub.unsubscribe(sub)
+
+
+def _republish(change: Dict[str, Any], serialize):
+    doc = change.get("fullDocument")
+    if not doc:
+        return
+    if change["operationType"] == "insert":
+        hub.publish("request_created", {"request": serialize(doc)}, doc.get("staffName"))
+    elif "status" in change.get("updateDescription", {}).get("updatedFields", {}):
+        hub.publish(
+            "status_changed", {"request": serialize(doc), "old_status": None}, doc.get("staffName")
+        )
+
+
+async def watch_change_stream(collection, serialize, opened: asyncio.Event):
+    """
+    Republish inserts and status updates on `collection` to the hub until cancelled. If the
+    first attempt fails (e.g. no replica set) the error is raised; `opened` is set once the
+    stream is open. Later errors are logged and the stream is reopened with backoff, resuming
+    after the last change seen so no event is lost.
+    """
+    pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}]
+    resume_token = None
+    delay = CHANGE_STREAM_RETRY_MIN_SECONDS
+    while True:
+        try:
+            async with collection.watch(pipeline, full_document="updateLookup", resume_after=resume_token) as stream:
+                opened.set()
+                delay = CHANGE_STREAM_RETRY_MIN_SECONDS
+                # The token is known before the first change, so even an idle stream resumes gap-free
+                resume_token = stream.resume_token or resume_token
+                async for change in stream:
+                    resume_token = stream.resume_token
+                    _republish(change, serialize)
+        except PyMongoError as e:
+            if not opened.is_set():
+                raise
+            hub.stream_errors += 1
+            print(f"⚠️ Change stream failed, reopening in {delay:.0f}s: {e!r}")
+            if isinstance(e, OperationFailure) and e.code == CHANGE_STREAM_HISTORY_LOST:
+                # Changes in the gap are gone; start fresh and have clients reload
+                resume_token = None
+                hub.resync()
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, CHANGE_STREAM_RETRY_MAX_SECONDS)
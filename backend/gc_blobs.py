@@ -0,0 +1,12 @@
+import asyncio
+from blobstore import blob_store
+
+async def main():
+    # Recount first so refcount drift does not keep garbage. Both steps are safe on a live
+    # server: recently referenced blobs are not recounted, and gc() re-checks before deleting.
+    await blob_store.recount()
+    removed = await blob_store.gc()
+    print(f"✅ Removed {removed} unreferenced blob(s)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,6 +1,5 @@
 from fastapi import FastAPI, Depends, HTTPException, Form, Body, UploadFile, File, Query
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, StreamingResponse, Response
 from fastapi.templating import Jinja2Templates
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from passlib.context import CryptContext
@@ -10,18 +9,51 @@ from starlette.requests import Request
 from datetime import datetime, timedelta, timezone
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-import os, shutil, re
-from typing import Dict, Any, Optional
+import os, re, hashlib, hmac, time, asyncio, threading, base64, json, csv, io
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+# Start of the readiness clock reported by startup(); the db/driver imports below count towards it
+MODULE_LOADED_AT = time.perf_counter()
 
 # --- DB Imports (Requires db.py and motor) ---
-# Assuming db.py correctly exports: users_collection, requests_collection, 
-# init_indexes, client, get_next_sequence_value
-from db import users_collection, requests_collection, init_indexes, client, get_next_sequence_value
+# Request IDs come from next_request_ids (block-allocated from the shared counter)
+from db import (
+    users_collection, requests_collection, bootstrap, client, next_request_ids,
+    bump_request_summary, move_request_summary, move_request_summaries, get_request_summary,
+    bump_spend_rollup, move_spend_rollups, rollups_collection, archive_collection, get_archive_cutoff,
+    month_key, bump_data_version, get_data_version, bump_users_version, get_users_version, bump_request_summaries, bump_spend_rollups, MONGO_MAX_POOL_SIZE,
+)
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+from cache import ResponseCache, TTLCache
+from uploads import UPLOAD_MAX_BYTES, stage_upload, validate_extension
+from blobstore import blob_store
+import thumbnails
+from events import hub, sse_stream, watch_change_stream, EVENTS_CHANGE_STREAM
+from metrics import Counter, Gauge, MetricsMiddleware, registry
+from compression import ASSET_DIST_DIR, AssetStaticFiles, CompressionMiddleware
+import admission
 
 load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY", "change_this_secret")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "10080"))
+# Signed /attachments URLs handed out by the list endpoints
+ATTACHMENT_URL_SECRET = os.getenv("ATTACHMENT_URL_SECRET", SECRET_KEY)
+ATTACHMENT_URL_TTL_SECONDS = int(os.getenv("ATTACHMENT_URL_TTL_SECONDS", "900"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+# How often each worker re-reads the shared users version; bounds how long another worker's
+# user delete or role change can go unnoticed
+USERS_VERSION_CHECK_SECONDS = float(os.getenv("USERS_VERSION_CHECK_SECONDS", "1"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "1024"))
+# Rendered admin list responses; entries also die on any request write (see db.bump_data_version)
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+# When set, /metrics requires "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
 
 # --- App Initialization ---
 app = FastAPI()
@@ -33,13 +65,24 @@ frontend_dir = os.path.join(project_root, "frontend")
 static_path = os.path.join(frontend_dir, "static")
 template_path = os.path.join(frontend_dir, "templates")
 
-# Use environment variable for upload path, fallback to a local folder in project root
-upload_path = os.getenv("UPLOAD_PATH", os.path.join(project_root, "uploads")) 
-os.makedirs(upload_path, exist_ok=True)
-
-app.mount("/static", StaticFiles(directory=static_path), name="static")
+app.mount("/static", AssetStaticFiles(directory=static_path), name="static")
 templates = Jinja2Templates(directory=template_path)
 
+# Hashed asset names written by build_assets.py; unbuilt assets are served under their own name
+def load_asset_manifest() -> Dict[str, str]:
+    try:
+        with open(os.path.join(static_path, ASSET_DIST_DIR, "manifest.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+asset_manifest = load_asset_manifest()
+
+def static_url(name: str) -> str:
+    return f"/static/{asset_manifest.get(name, name)}"
+
+templates.env.globals["static_url"] = static_url
+
 # --- CORSMiddleware configuration (This section has been fixed for indentation) ---
 app.add_middleware(
     CORSMiddleware,
@@ -49,6 +92,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Admission Control ---
+# Bounded concurrency for uploads and unpaged/heavy reads; excess gets a fast 503 with
+# Retry-After. Added before the size guard so oversized uploads are refused without queueing.
+app.add_middleware(admission.AdmissionMiddleware)
+
+# --- Upload Size Guard ---
+# Reject oversized submissions from Content-Length before the multipart body is parsed;
+# stage_upload() still enforces the limit while streaming for chunked requests.
+BATCH_SUBMIT_MAX_ITEMS = int(os.getenv("BATCH_SUBMIT_MAX_ITEMS", "25"))
+# Largest acceptable body per upload route: one proof each, or one per batch item
+UPLOAD_ROUTES = {
+    "/submit_reimbursement": UPLOAD_MAX_BYTES,
+    "/submit_payment": UPLOAD_MAX_BYTES,
+    "/submit_batch": UPLOAD_MAX_BYTES * BATCH_SUBMIT_MAX_ITEMS,
+}
+UPLOAD_FORM_OVERHEAD = 64 * 1024
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    if request.method == "POST" and request.url.path in UPLOAD_ROUTES:
+        content_length = request.headers.get("content-length", "")
+        limit = UPLOAD_ROUTES[request.url.path] + UPLOAD_FORM_OVERHEAD
+        if content_length.isdigit() and int(content_length) > limit:
+            return JSONResponse(status_code=413, content={"detail": "Upload too large"})
+    return await call_next(request)
+
+# br/gzip for JSON, CSV/NDJSON exports and HTML above COMPRESS_MIN_BYTES (see compression.py)
+app.add_middleware(CompressionMiddleware)
+
+# Outermost, so it times everything including the middleware above
+app.add_middleware(MetricsMiddleware)
+
 # --- Security ---
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated=["auto"])
@@ -56,13 +131,83 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated=["auto"])
 def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
+# --- Password Worker Pool ---
+# bcrypt takes tens to hundreds of ms per call, so it must never run on the event loop.
+# The pool size caps how many hashes run at once; extra calls wait in the executor queue.
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+password_stats = {"calls": 0, "queued": 0, "running": 0, "wait_total_ms": 0.0, "wait_max_ms": 0.0}
+_password_stats_lock = threading.Lock()
+
+def _timed_password_call(fn, submitted_at: float, *args):
+    waited_ms = (time.perf_counter() - submitted_at) * 1000
+    with _password_stats_lock:
+        password_stats["queued"] -= 1
+        password_stats["running"] += 1
+        password_stats["wait_total_ms"] += waited_ms
+        password_stats["wait_max_ms"] = max(password_stats["wait_max_ms"], waited_ms)
+    try:
+        return fn(*args)
+    finally:
+        with _password_stats_lock:
+            password_stats["running"] -= 1
+
+async def run_password_task(fn, *args):
+    with _password_stats_lock:
+        password_stats["calls"] += 1
+        password_stats["queued"] += 1
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, _timed_password_call, fn, time.perf_counter(), *args)
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await run_password_task(verify_password, plain, hashed)
+
+async def hash_password_async(plain: str) -> str:
+    return await run_password_task(pwd_context.hash, plain)
+
+# --- Authenticated-user cache ---
+# User records keyed by username, decoded token payloads keyed by token digest. Both are
+# per-worker. User records are stamped with the shared users version (db.bump_users_version),
+# so invalidate_user() in one worker retires them in every worker within
+# USERS_VERSION_CHECK_SECONDS, and the role mismatch check in get_current_user sees the change.
+user_cache = TTLCache(maxsize=USER_CACHE_MAX_ENTRIES, ttl=USER_CACHE_TTL_SECONDS)
+token_cache = TTLCache(maxsize=USER_CACHE_MAX_ENTRIES, ttl=USER_CACHE_TTL_SECONDS)
+_users_version = {"value": 0, "checked_at": float("-inf")}
+
+async def current_users_version() -> int:
+    # At most one counters read per worker per USERS_VERSION_CHECK_SECONDS
+    now = time.monotonic()
+    if now - _users_version["checked_at"] >= USERS_VERSION_CHECK_SECONDS:
+        _users_version["value"] = await get_users_version()
+        _users_version["checked_at"] = now
+    return _users_version["value"]
+
+async def invalidate_user(username: str):
+    user_cache.pop(username)
+    await bump_users_version()
+    # This worker re-reads the version on its next lookup
+    _users_version["checked_at"] = float("-inf")
+
 async def get_user(username: str):
     return await users_collection.find_one({"username": username})
 
+async def get_cached_user(username: str):
+    # Read the version before the user, so a racing write leaves an already-outdated stamp
+    version = await current_users_version()
+    entry = user_cache.get(username)
+    if entry is not None and entry[0] == version:
+        user = entry[1]
+    else:
+        user = await get_user(username)
+        if user is None:
+            return None
+        user_cache.set(username, (version, user))
+    # Hand out a copy so callers cannot mutate the cached record
+    return dict(user)
+
 async def authenticate_user(username: str, password: str):
     user = await get_user(username)
     # Check if user exists AND password is correct
-    if not user or not verify_password(password, user.get("hashed_password", "")):
+    if not user or not await verify_password_async(password, user.get("hashed_password", "")):
         return False
     return user
 
@@ -85,14 +230,26 @@ def decode_token_payload(token: str) -> Dict[str, Any]:
         role: str = payload.get("role")
         if username is None or role is None:
             raise credentials_exception
-        return {"username": username, "role": role}
+        return {"username": username, "role": role, "exp": payload.get("exp")}
     except JWTError:
         raise credentials_exception
 
+def decode_token_payload_cached(token: str) -> Dict[str, Any]:
+    key = hashlib.sha256(token.encode()).hexdigest()
+    payload = token_cache.get(key)
+    if payload is None:
+        payload = decode_token_payload(token)
+        # Never keep a decoded token around past its own expiry
+        ttl = USER_CACHE_TTL_SECONDS
+        if payload.get("exp") is not None:
+            ttl = min(ttl, float(payload["exp"]) - time.time())
+        token_cache.set(key, payload, ttl=ttl)
+    return payload
+
 # MODIFIED: get_current_user now accepts token directly or via Depends
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     # Decode payload first
-    payload = decode_token_payload(token)
+    payload = decode_token_payload_cached(token)
     username = payload["username"]
     role = payload["role"]
     
@@ -102,8 +259,8 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    # Verify against DB for user existence
-    user = await get_user(username)
+    # Verify against DB for user existence (served from user_cache when warm)
+    user = await get_cached_user(username)
     if user is None:
         raise credentials_exception
     
@@ -123,15 +280,132 @@ def serialize_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
         
     doc["_id"] = str(doc["_id"])
     
-    # Format datetimes consistently (now all datetimes should be UTC-aware)
-    for k in ("created_at", "paid_date", "approved_date"):
-        if k in doc and isinstance(doc[k], datetime):
-            # Ensure it is UTC before converting to ISO string
-            if doc[k].tzinfo is None:
-                 doc[k] = doc[k].replace(tzinfo=timezone.utc)
-            doc[k] = doc[k].isoformat()
+    # Format every datetime field consistently (created_at, paid_date, status_changed_at, ...),
+    # so a newly added date field can never make a response unserializable
+    for k, v in doc.items():
+        if isinstance(v, datetime):
+            # Stored datetimes are UTC; the driver hands them back naive
+            if v.tzinfo is None:
+                v = v.replace(tzinfo=timezone.utc)
+            doc[k] = v.isoformat()
     return doc
 
+# --- Keyset Pagination ---
+# Pages are ordered by (sort_field desc, _id desc). The cursor is an opaque, URL-safe
+# token holding the last row's sort value and _id, so each page is an index range scan
+# instead of a skip over everything before it.
+PAGE_LIMIT_MAX = 500
+
+def encode_cursor(sort_value: datetime, oid: ObjectId) -> str:
+    raw = json.dumps({"v": sort_value.isoformat(), "id": str(oid)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["v"]), ObjectId(data["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+def merge_with_archive(hot: List[Dict[str, Any]], cold: List[Dict[str, Any]], key) -> List[Dict[str, Any]]:
+    # An interrupted archive run can leave a request in both collections; the live copy wins
+    live_ids = {r["_id"] for r in hot}
+    return sorted(hot + [r for r in cold if r["_id"] not in live_ids], key=key, reverse=True)
+
+async def fetch_page(
+    query: Dict[str, Any], sort_field: str, limit: int, cursor: Optional[str], include_archive: bool = False
+) -> Dict[str, Any]:
+    if cursor:
+        last_value, last_id = decode_cursor(cursor)
+        query = {"$and": [query, {"$or": [
+            {sort_field: {"$lt": last_value}},
+            {sort_field: last_value, "_id": {"$lt": last_id}},
+        ]}]}
+    # Fetch one extra row to know whether another page exists
+    recs = await requests_collection.find(query).sort([(sort_field, -1), ("_id", -1)]).to_list(limit + 1)
+    cutoff = await get_archive_cutoff() if include_archive else None
+    # Archived rows all sort before the cutoff: only read the archive once the page reaches that far
+    if cutoff and (len(recs) <= limit or recs[-1][sort_field] < cutoff):
+        archived = await archive_collection.find(query).sort([(sort_field, -1), ("_id", -1)]).to_list(limit + 1)
+        recs = merge_with_archive(recs, archived, key=lambda r: (r[sort_field], r["_id"]))
+    next_cursor = None
+    if len(recs) > limit:
+        recs = recs[:limit]
+        last = recs[-1]
+        next_cursor = encode_cursor(last[sort_field], last["_id"])
+    return {"items": [serialize_request(r) for r in recs], "next": next_cursor}
+
+async def find_all_with_archive(query: Dict[str, Any], sort_field: str) -> List[Dict[str, Any]]:
+    # Unpaged all-time lists: live and archived rows in one (sort_field desc, _id desc) order
+    hot, cold = await asyncio.gather(
+        requests_collection.find(query).sort([(sort_field, -1), ("_id", -1)]).to_list(None),
+        archive_collection.find(query).sort([(sort_field, -1), ("_id", -1)]).to_list(None),
+    )
+    if not cold:
+        return hot
+    return merge_with_archive(hot, cold, key=lambda r: (r[sort_field], r["_id"]))
+
+async def archive_may_match(date_range: Optional[Dict[str, datetime]]) -> bool:
+    # Every archived row was created and paid before the cutoff, so a range starting at or
+    # after it (on either date) cannot match any; no range at all means all time
+    cutoff = await get_archive_cutoff()
+    if not cutoff:
+        return False
+    start = (date_range or {}).get("$gte")
+    return start is None or start < cutoff.replace(tzinfo=timezone.utc)
+
+# --- Signed Attachment URLs ---
+# List endpoints only return rows the caller may see, so each row's proof link can carry
+# that decision as an HMAC over (filename, blob, expiry). Serving a signed link then needs
+# no JWT decode and no DB lookup.
+SIGNED_URL_BUCKET_SECONDS = 300
+
+def sign_attachment(filename: str, blob: str, exp: int) -> str:
+    msg = f"{filename}\n{blob}\n{exp}".encode()
+    return hmac.new(ATTACHMENT_URL_SECRET.encode(), msg, hashlib.sha256).hexdigest()
+
+def signed_attachment_url(filename: str, blob: Optional[str]) -> str:
+    # Round expiry up to a bucket so repeated list loads yield the same URL and browsers can cache it
+    exp = int(time.time()) + ATTACHMENT_URL_TTL_SECONDS
+    exp += -exp % SIGNED_URL_BUCKET_SECONDS
+    blob = blob or ""
+    sig = sign_attachment(filename, blob, exp)
+    return f"/attachments/{quote(filename)}?b={blob}&exp={exp}&sig={sig}"
+
+def verify_attachment_signature(filename: str, blob: str, exp: str, sig: str) -> bool:
+    if not exp.isdigit() or int(exp) < time.time():
+        return False
+    return hmac.compare_digest(sign_attachment(filename, blob, int(exp)), sig)
+
+def serialize_request(doc: Dict[str, Any]) -> Dict[str, Any]:
+    # serialize_doc plus a ready-to-use signed proof link (picked up by proofLink() in script.js)
+    doc = serialize_doc(doc)
+    if doc.get("proof_filename"):
+        doc["proof_full_url"] = signed_attachment_url(doc["proof_filename"], doc.get("proof_blob"))
+    return doc
+
+def parse_date_param(value: Optional[str], name: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {name} format. Expected YYYY-MM-DD.")
+
+def date_range_filter(start: Optional[str], end: Optional[str]) -> Optional[Dict[str, datetime]]:
+    # Inclusive YYYY-MM-DD bounds as a Mongo range, or None when neither is given
+    start_dt = parse_date_param(start, "start")
+    end_dt = parse_date_param(end, "end")
+    if not start_dt and not end_dt:
+        return None
+    date_range = {}
+    if start_dt:
+        date_range["$gte"] = start_dt
+    if end_dt:
+        date_range["$lt"] = end_dt + timedelta(days=1)
+    return date_range
+
 # Returns a timezone-aware datetime object (UTC)
 def get_current_month_start() -> datetime:
     now = datetime.now(timezone.utc)
@@ -150,19 +424,67 @@ def clean_filename(original_filename: str, username: str) -> str:
 # --- Startup & Shutdown ---
 @app.on_event("startup")
 async def startup():
+    timings = {}
+    phase_start = time.perf_counter()
     try:
         await client.admin.command("ping")
-        await init_indexes()
-        print("✅ MongoDB connected and indexes ready")
+        timings["ping"] = time.perf_counter() - phase_start
+        phase_start = time.perf_counter()
+        # Index/counter setup runs once per schema version, in one worker (see db.bootstrap)
+        bootstrap_result = await bootstrap()
+        timings["bootstrap"] = time.perf_counter() - phase_start
+        print(f"✅ MongoDB connected (schema {bootstrap_result})")
     except Exception as e:
         print(f"❌ CRITICAL ERROR: MongoDB connection failed during startup. Check MONGO_URI and network access. Details: {e}")
         raise e 
 
-    # Default Admin Creation
+    phase_start = time.perf_counter()
+    await ensure_default_admin()
+    timings["admin"] = time.perf_counter() - phase_start
+
+    if EVENTS_CHANGE_STREAM:
+        phase_start = time.perf_counter()
+        await start_change_stream()
+        timings["change_stream"] = time.perf_counter() - phase_start
+        print("✅ Event hub fed from MongoDB change stream")
+
+    # Readiness timing, reported by /health and /metrics
+    app.state.startup = {
+        "bootstrap": bootstrap_result,
+        "ready_seconds": round(time.perf_counter() - MODULE_LOADED_AT, 3),
+        "phases": {name: round(seconds, 3) for name, seconds in timings.items()},
+    }
+    print(f"✅ Ready in {app.state.startup['ready_seconds']}s {app.state.startup['phases']}")
+
+CHANGE_STREAM_START_TIMEOUT_SECONDS = 10
+
+async def start_change_stream():
+    # With EVENTS_CHANGE_STREAM on, writes are not published locally, so a stream that cannot
+    # open (no replica set, wrong permissions) must fail startup rather than go quiet
+    opened = asyncio.Event()
+    task = asyncio.create_task(watch_change_stream(requests_collection, serialize_request, opened))
+    waiter = asyncio.create_task(opened.wait())
+    await asyncio.wait({task, waiter}, timeout=CHANGE_STREAM_START_TIMEOUT_SECONDS, return_when=asyncio.FIRST_COMPLETED)
+    waiter.cancel()
+    if task.done():
+        raise RuntimeError(f"MongoDB change stream could not be opened: {task.exception()!r}")
+    if not opened.is_set():
+        task.cancel()
+        raise RuntimeError(f"MongoDB change stream did not open within {CHANGE_STREAM_START_TIMEOUT_SECONDS}s")
+    task.add_done_callback(_change_stream_ended)
+    app.state.change_stream_task = task
+
+def _change_stream_ended(task: asyncio.Task):
+    # The watcher retries on its own; ending any other way than cancellation is a bug worth seeing
+    if not task.cancelled() and task.exception():
+        print(f"❌ Change stream watcher stopped, live updates are off: {task.exception()!r}")
+
+async def ensure_default_admin():
     admin_pass = os.getenv("ADMIN_PASS", "nou123")
-    admin = await users_collection.find_one({"username": "nou"})
-    if not admin:
-        hashed = pwd_context.hash(admin_pass)
+    if await users_collection.find_one({"username": "nou"}, {"_id": 1}):
+        return
+    hashed = await hash_password_async(admin_pass)
+    try:
         await users_collection.insert_one({
             "username": "nou",
             "hashed_password": hashed,
@@ -170,9 +492,17 @@ async def startup():
             "created_at": datetime.now(timezone.utc)
         })
         print(f"✅ Default admin created: nou / {admin_pass}")
+    except DuplicateKeyError:
+        # Another worker created it first
+        pass
 
 @app.on_event("shutdown")
 async def shutdown():
+    task = getattr(app.state, "change_stream_task", None)
+    if task:
+        task.cancel()
+    password_executor.shutdown(wait=False)
+    thumbnails.shutdown()
     if client:
         client.close()
     print("🔒 MongoDB connection closed")
@@ -182,7 +512,7 @@ async def shutdown():
 async def health_check():
     try:
         await client.admin.command("ping")
-        return {"status": "ok", "mongo": "connected"}
+        return {"status": "ok", "mongo": "connected", "startup": getattr(app.state, "startup", None)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
 
@@ -221,49 +551,67 @@ async def create_user(
     if role not in ["staff", "admin"]:
         raise HTTPException(status_code=400, detail="Invalid role")
         
-    hashed = pwd_context.hash(password)
+    hashed = await hash_password_async(password)
     await users_collection.insert_one({
         "username": username,
         "hashed_password": hashed,
         "role": role,
         "created_at": datetime.now(timezone.utc)
     })
+    await invalidate_user(username)
     return {"message": "User created"}
 
+async def find_users() -> List[Dict[str, Any]]:
+    # Exclude hashed_password for security
+    users = await users_collection.find({}, {"hashed_password": 0}).to_list(500)
+    return [serialize_doc(u) for u in users]
+
 @app.get("/admin/users")
 async def list_users(user: dict = Depends(get_current_user)):
     if user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admins only")
-    # Exclude hashed_password for security
-    users = await users_collection.find({}, {"hashed_password": 0}).to_list(500)
-    users = [serialize_doc(u) for u in users]
-    return JSONResponse(content=users)
+    return JSONResponse(content=await find_users())
 
 @app.delete("/admin/users/{username}")
 async def delete_user(username: str, user: dict = Depends(get_current_user)):
+    """Delete an account. Its tokens stop working in every worker within USERS_VERSION_CHECK_SECONDS."""
     if user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admins only")
     if username == user["username"]:
         raise HTTPException(status_code=400, detail="Cannot delete your own admin account")
     
     result = await users_collection.delete_one({"username": username})
+    await invalidate_user(username)
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
         
     return {"message": f"User '{username}' deleted"}
 
+@app.get("/admin/cache_stats")
+async def cache_stats(user: dict = Depends(get_current_user)):
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admins only")
+    return {"users": user_cache.stats(), "tokens": token_cache.stats(), "responses": response_cache.stats()}
+
+@app.get("/admin/password_stats")
+async def get_password_stats(user: dict = Depends(get_current_user)):
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admins only")
+    calls = password_stats["calls"]
+    return {
+        **password_stats,
+        "workers": PASSWORD_HASH_WORKERS,
+        "wait_avg_ms": round(password_stats["wait_total_ms"] / calls, 3) if calls else 0.0,
+    }
+
+@app.get("/admin/admission_stats")
+async def get_admission_stats(user: dict = Depends(get_current_user)):
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admins only")
+    return {**admission.stats(), "mongo_max_pool_size": MONGO_MAX_POOL_SIZE}
+
 # --- Submission Endpoints ---
-@app.post("/submit_reimbursement")
-async def submit_reimbursement(
-    date: str = Form(...),
-    description: str = Form(...),
-    amount: str = Form(...),
-    proof: UploadFile = File(...),
-    user: dict = Depends(get_current_user)
-):
-    if user["role"] != "staff":
-        raise HTTPException(status_code=403, detail="Staff only")
-        
+def validate_submission_fields(date: str, amount: str, proof: UploadFile) -> float:
     try:
         # Basic date validation
         datetime.strptime(date, '%Y-%m-%d')
@@ -277,44 +625,80 @@ async def submit_reimbursement(
     except ValueError:
         raise HTTPException(status_code=400, detail="Amount must be a positive number")
 
-    ALLOWED_EXTS = {".pdf", ".jpg", ".jpeg", ".png"}
-    ext = os.path.splitext(proof.filename)[1].lower()
-    if ext not in ALLOWED_EXTS:
-        raise HTTPException(status_code=400, detail=f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTS)}")
+    validate_extension(proof.filename)
+    return amt_val
+
+def publish_request_event(event: str, doc: Dict[str, Any], old_status: Optional[str] = None):
+    # With a change stream configured the hub is fed from Mongo instead, so skip to avoid duplicates
+    if EVENTS_CHANGE_STREAM:
+        return
+    hub.publish(event, {"request": serialize_request(dict(doc)), "old_status": old_status}, doc.get("staffName"))
 
+def schedule_proof_variants(doc: Dict[str, Any]):
+    # Background thumbnail/preview rendering for image proofs in the blob store
+    if doc.get("proof_blob"):
+        sha256 = doc["proof_blob"]
+        thumbnails.schedule_variants(
+            blob_store.path_for(sha256), doc["proof_filename"],
+            blob_store.variant_path(sha256, "thumb"), blob_store.variant_path(sha256, "preview"),
+        )
+
+async def save_submission(user: dict, req_type: str, fields: Dict[str, Any], proof: UploadFile) -> str:
+    # Stream the proof to a temp file first; it only enters the blob store once the DB insert succeeded
     filename = clean_filename(proof.filename, user['username'])
-    file_path = os.path.join(upload_path, filename)
-    try:
-        # Copy file to the dedicated upload path
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(proof.file, buffer)
-    except Exception as e:
-        # Ensure file is closed even if copy fails
-        proof.file.close() 
-        raise HTTPException(status_code=500, detail=f"File upload failed on server: {str(e)}")
+    staged = await stage_upload(proof)
 
-    next_seq = await get_next_sequence_value("request_id")
-    req_id = f"PR{next_seq:04d}"
+    req_id = (await next_request_ids())[0]
 
     doc = {
-        "type": "reimbursement",
+        "type": req_type,
         "request_id": req_id,
         "staffName": user["username"],
-        "date": date,
-        "description": description,
-        "amount": amt_val,
+        **fields,
         "status": "Pending",
         "proof_filename": filename,
+        "proof_blob": staged.sha256,
+        "proof_size": staged.size,
         "created_at": datetime.now(timezone.utc)
     }
     try:
         await requests_collection.insert_one(doc)
-        return {"message": f"Reimbursement request submitted with ID: {req_id}", "request_id": req_id}
     except Exception as e:
-        # If DB insert fails, try to clean up the uploaded file
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        # If DB insert fails, drop the staged file
+        await staged.discard()
         raise HTTPException(status_code=500, detail=f"Database submission failed: {str(e)}")
+    try:
+        await blob_store.put(staged)
+    except Exception as e:
+        # Without its file the request is unusable, so roll the insert back
+        await requests_collection.delete_one({"_id": doc["_id"]})
+        await staged.discard()
+        raise HTTPException(status_code=500, detail=f"File upload failed on server: {str(e)}")
+    await asyncio.gather(
+        bump_request_summary(doc["created_at"], doc["type"], doc["status"]),
+        bump_spend_rollup(doc),
+        bump_data_version(),
+    )
+    schedule_proof_variants(doc)
+    publish_request_event("request_created", doc)
+    return req_id
+
+@app.post("/submit_reimbursement")
+async def submit_reimbursement(
+    date: str = Form(...),
+    description: str = Form(...),
+    amount: str = Form(...),
+    proof: UploadFile = File(...),
+    user: dict = Depends(get_current_user)
+):
+    if user["role"] != "staff":
+        raise HTTPException(status_code=403, detail="Staff only")
+
+    amt_val = validate_submission_fields(date, amount, proof)
+    req_id = await save_submission(
+        user, "reimbursement", {"date": date, "description": description, "amount": amt_val}, proof
+    )
+    return {"message": f"Reimbursement request submitted with ID: {req_id}", "request_id": req_id}
 
 
 @app.post("/submit_payment")
@@ -327,75 +711,188 @@ async def submit_payment(
 ):
     if user["role"] != "staff":
         raise HTTPException(status_code=403, detail="Staff only")
-        
+
+    amt_val = validate_submission_fields(date, amount, proof)
+    req_id = await save_submission(
+        user, "payment", {"date": date, "purpose": purpose, "amount": amt_val}, proof
+    )
+    return {"message": f"Payment request submitted with ID: {req_id}", "request_id": req_id}
+
+
+# --- Response Cache ---
+# Admin list pages are identical for every admin between two writes, so the rendered body is
+# reused until the data version moves. Entries never outlive half the signed-URL lifetime,
+# so cached proof links are always still valid when served.
+response_cache = ResponseCache(TTLCache(
+    maxsize=256,
+    ttl=min(RESPONSE_CACHE_TTL_SECONDS, ATTACHMENT_URL_TTL_SECONDS / 2),
+    max_bytes=RESPONSE_CACHE_MAX_BYTES,
+    sizeof=lambda entry: len(entry.body),
+))
+
+async def cached_json(request: Request, key: tuple, build) -> Response:
+    """Serve `await build()` as JSON through response_cache, answering matching If-None-Match with 304."""
+    # Read the version before querying: a write racing with the build then leaves the entry
+    # stamped with an already-outdated version, never the other way round
+    version = await get_data_version()
+    entry = response_cache.get(key, version)
+    if entry is None:
+        entry = response_cache.put(key, version, JSONResponse(content=await build()).body)
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("If-None-Match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+# Text field each request type carries next to date and amount
+SUBMISSION_TEXT_FIELDS = {"reimbursement": "description", "payment": "purpose"}
+
+def validate_batch_items(items: str, proofs: List[UploadFile]) -> List[Dict[str, Any]]:
+    """Parse and check every line item before anything is written; all problems are reported at once."""
     try:
-        # Basic date validation
-        datetime.strptime(date, '%Y-%m-%d')
+        parsed = json.loads(items)
     except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid date format. Expected YYYY-MM-DD.")
-    
-    try:
-        amt_val = float(amount)
-        if amt_val <= 0:
-            raise ValueError("Amount must be positive.")
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Amount must be a positive number")
+        raise HTTPException(status_code=400, detail="items must be a JSON array")
+    if not isinstance(parsed, list) or not parsed:
+        raise HTTPException(status_code=400, detail="items must be a non-empty JSON array")
+    if len(parsed) > BATCH_SUBMIT_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_SUBMIT_MAX_ITEMS} items per batch")
+    if len(proofs) != len(parsed):
+        raise HTTPException(status_code=400, detail="Send exactly one proof file per item, in item order")
 
-    ALLOWED_EXTS = {".pdf", ".jpg", ".jpeg", ".png"}
-    ext = os.path.splitext(proof.filename)[1].lower()
-    if ext not in ALLOWED_EXTS:
-        raise HTTPException(status_code=400, detail=f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTS)}")
+    valid, errors = [], []
+    for index, (item, proof) in enumerate(zip(parsed, proofs)):
+        try:
+            if not isinstance(item, dict):
+                raise HTTPException(status_code=400, detail="Item must be an object")
+            req_type = item.get("type")
+            if req_type not in SUBMISSION_TEXT_FIELDS:
+                raise HTTPException(status_code=400, detail="type must be 'reimbursement' or 'payment'")
+            text_field = SUBMISSION_TEXT_FIELDS[req_type]
+            text = item.get(text_field)
+            if not isinstance(text, str) or not text.strip():
+                raise HTTPException(status_code=400, detail=f"{text_field} is required")
+            amt_val = validate_submission_fields(str(item.get("date", "")), str(item.get("amount", "")), proof)
+            valid.append({"type": req_type, "fields": {"date": item["date"], text_field: text, "amount": amt_val}})
+        except HTTPException as e:
+            errors.append({"index": index, "error": e.detail})
+    if errors:
+        raise HTTPException(status_code=400, detail={"message": "Batch rejected; nothing was saved", "errors": errors})
+    return valid
 
-    filename = clean_filename(proof.filename, user['username'])
-    file_path = os.path.join(upload_path, filename)
-    try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(proof.file, buffer)
-    except Exception as e:
-        # Ensure file is closed even if copy fails
-        proof.file.close()
-        raise HTTPException(status_code=500, detail=f"File upload failed on server: {str(e)}")
+@app.post("/submit_batch")
+async def submit_batch(
+    items: str = Form(..., description='JSON array: [{"type", "date", "amount", "description" | "purpose"}, ...]'),
+    proofs: List[UploadFile] = File(..., description="One proof per item, in the same order"),
+    user: dict = Depends(get_current_user)
+):
+    """
+    Submit many reimbursement/payment line items in one request, all or nothing.
+    IDs come from one counter reservation, proofs are staged concurrently, and the
+    requests are written with a single insert_many.
+    """
+    if user["role"] != "staff":
+        raise HTTPException(status_code=403, detail="Staff only")
+    valid = validate_batch_items(items, proofs)
 
-    next_seq = await get_next_sequence_value("request_id")
-    req_id = f"PR{next_seq:04d}"
+    results = await asyncio.gather(*(stage_upload(proof) for proof in proofs), return_exceptions=True)
+    staged = [r for r in results if not isinstance(r, BaseException)]
+    failure = next((r for r in results if isinstance(r, BaseException)), None)
+    if failure is not None:
+        await asyncio.gather(*(item.discard() for item in staged))
+        if isinstance(failure, HTTPException):
+            raise failure
+        raise HTTPException(status_code=500, detail=f"File upload failed on server: {str(failure)}")
 
-    doc = {
-        "type": "payment",
-        "request_id": req_id,
-        "staffName": user["username"],
-        "date": date,
-        "purpose": purpose,
-        "amount": amt_val,
-        "status": "Pending",
-        "proof_filename": filename,
-        "created_at": datetime.now(timezone.utc)
-    }
+    req_ids = await next_request_ids(len(valid))
+    now = datetime.now(timezone.utc)
+    docs = [
+        {
+            "type": item["type"],
+            "request_id": req_id,
+            "staffName": user["username"],
+            **item["fields"],
+            "status": "Pending",
+            # The request ID keeps same-named receipts in one batch from sharing a filename
+            "proof_filename": clean_filename(f"{req_id}_{proof.filename}", user["username"]),
+            "proof_blob": upload.sha256,
+            "proof_size": upload.size,
+            "created_at": now,
+        }
+        for item, req_id, proof, upload in zip(valid, req_ids, proofs, staged)
+    ]
     try:
-        await requests_collection.insert_one(doc)
-        return {"message": f"Payment request submitted with ID: {req_id}", "request_id": req_id}
+        await requests_collection.insert_many(docs)
     except Exception as e:
-        # If DB insert fails, try to clean up the uploaded file
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        # An ordered insert may have stored a prefix of the batch; take it back out
+        await requests_collection.delete_many({"_id": {"$in": [d["_id"] for d in docs if "_id" in d]}})
+        await asyncio.gather(*(item.discard() for item in staged))
         raise HTTPException(status_code=500, detail=f"Database submission failed: {str(e)}")
+    try:
+        await blob_store.put_many(staged)
+    except Exception as e:
+        await requests_collection.delete_many({"_id": {"$in": [d["_id"] for d in docs]}})
+        await asyncio.gather(*(item.discard() for item in staged))
+        raise HTTPException(status_code=500, detail=f"File upload failed on server: {str(e)}")
+
+    await asyncio.gather(bump_request_summaries(docs), bump_spend_rollups(docs), bump_data_version())
+    for doc in docs:
+        schedule_proof_variants(doc)
+        publish_request_event("request_created", doc)
+    return {"message": f"{len(docs)} requests submitted", "request_ids": req_ids}
 
 
 # --- Dashboard & Review Endpoints ---
+# Query helpers shared by the individual endpoints below and by /dashboard
+async def find_my_requests(username: str) -> List[Dict[str, Any]]:
+    month_start = get_current_month_start()
+    # Filter for the current user and for requests created this month or later
+    query = {"staffName": username, "created_at": {"$gte": month_start}}
+    recs = await requests_collection.find(query).sort("created_at", -1).to_list(500)
+    return [serialize_request(r) for r in recs]
+
+async def find_admin_requests(req_type: Optional[str]) -> List[Dict[str, Any]]:
+    # Focus on Pending/Approved/Rejected requests created this month or later
+    query = {"created_at": {"$gte": get_current_month_start()}, "status": {"$ne": "Paid"}}
+    if req_type:
+        query["type"] = req_type
+    recs = await requests_collection.find(query).sort("created_at", -1).to_list(500)
+    return [serialize_request(r) for r in recs]
+
+summary_drift = registry.register(Counter(
+    "app_summary_negative_reads_total", "Reads of a negative request summary bucket (counter drift)", ("type", "status")))
+_reported_drift = set()
+
+def report_summary_drift(month: str, counts: Dict[str, Dict[str, int]]):
+    # A bucket can only go negative if a $inc was lost or doubled; the stored value is still
+    # returned as-is so the drift stays visible. rebuild_summaries.py recomputes the counters.
+    for req_type, statuses in counts.items():
+        for status, value in statuses.items():
+            if value < 0:
+                summary_drift.inc((req_type, status))
+                if (month, req_type, status, value) not in _reported_drift:
+                    _reported_drift.add((month, req_type, status, value))
+                    print(f"⚠️ Request summary drift: {month} {req_type}/{status} = {value}; run rebuild_summaries.py")
+
+async def pending_summary_counts() -> Dict[str, int]:
+    # Single read of this month's materialized counters (see db.bump_request_summary)
+    month_start = get_current_month_start()
+    counts = await get_request_summary(month_start)
+    report_summary_drift(month_key(month_start), counts)
+    # Drift is reported above; the UI still never shows a negative count
+    r_count = max(counts.get("reimbursement", {}).get("Pending", 0), 0)
+    p_count = max(counts.get("payment", {}).get("Pending", 0), 0)
+    return {"reimbursement_pending": r_count, "payment_pending": p_count}
+
 @app.get("/my_requests")
 async def get_my_requests(user: dict = Depends(get_current_user)):
     # Staff can see all their requests from the current month onwards (Dashboard/Current)
     if user["role"] != "staff":
         raise HTTPException(status_code=403, detail="Staff only")
-        
-    month_start = get_current_month_start()
-    # Filter for the current user and for requests created this month or later
-    query = {"staffName": user["username"], "created_at": {"$gte": month_start}}
-    recs = await requests_collection.find(query).sort("created_at", -1).to_list(500)
-    recs = [serialize_doc(r) for r in recs]
-    return JSONResponse(content=recs)
+    return JSONResponse(content=await find_my_requests(user["username"]))
 
 @app.get("/admin/requests")
 async def admin_requests(
+    request: Request,
     user: dict = Depends(get_current_user),
     type: str = Query(None, description="Filter by type: 'reimbursement' or 'payment'")
 ):
@@ -403,60 +900,55 @@ async def admin_requests(
     if user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admins only")
         
-    month_start = get_current_month_start()
-    # Focus on Pending/Approved/Rejected requests created this month or later
-    query = {"created_at": {"$gte": month_start}, "status": {"$ne": "Paid"}}
-    
-    if type in ["reimbursement", "payment"]:
-        query["type"] = type
-        
-    recs = await requests_collection.find(query).sort("created_at", -1).to_list(500)
-    recs = [serialize_doc(r) for r in recs]
-    return JSONResponse(content=recs)
+    req_type = type if type in ["reimbursement", "payment"] else None
+    return await cached_json(
+        request, ("admin_requests", get_current_month_start(), req_type), lambda: find_admin_requests(req_type)
+    )
 
 @app.get("/admin/pending_summary")
 async def get_pending_summary(user: dict = Depends(get_current_user)):
     if user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admins only")
-        
-    month_start = get_current_month_start()
-    base_query = {"status": "Pending", "created_at": {"$gte": month_start}}
-    
-    r_count = await requests_collection.count_documents({**base_query, "type": "reimbursement"})
-    p_count = await requests_collection.count_documents({**base_query, "type": "payment"})
-    
-    return {"reimbursement_pending": r_count, "payment_pending": p_count}
+    return await pending_summary_counts()
 
-@app.patch("/admin/requests/{request_id_or_oid}")
-async def update_status(request_id_or_oid: str, payload: dict = Body(...), user: dict = Depends(get_current_user)):
-    if user["role"] != "admin":
-        raise HTTPException(status_code=403, detail="Admins only")
-        
-    # Build query to find the document by request_id (PRxxxx) or internal _id (ObjectId)
-    query = {}
-    
-    # Check if it matches the unique request ID format (e.g., PR0001)
-    if re.match(r"PR\d{4}$", request_id_or_oid):
-        query = {"request_id": request_id_or_oid}
-    else:
-        # Otherwise, assume it's an ObjectId
-        try:
-            oid = ObjectId(request_id_or_oid)
-            query = {"_id": oid}
-        except Exception:
-            raise HTTPException(status_code=400, detail="Invalid request identifier format")
-    
-    doc = await requests_collection.find_one(query)
-    if not doc:
-        raise HTTPException(status_code=404, detail="Request ID not found")
+@app.get("/dashboard")
+async def dashboard(user: dict = Depends(get_current_user)):
+    """
+    Everything the first screen after login needs, in one authenticated round trip.
+    Staff: this month's requests. Admin: pending counts, this month's open requests
+    (all types) and the user list, queried concurrently.
+    """
+    if user["role"] == "admin":
+        summary, requests, users = await asyncio.gather(
+            pending_summary_counts(), find_admin_requests(None), find_users()
+        )
+        return JSONResponse(content={
+            "role": "admin", "username": user["username"],
+            "pending_summary": summary, "admin_requests": requests, "users": users,
+        })
+    return JSONResponse(content={
+        "role": user["role"], "username": user["username"],
+        "my_requests": await find_my_requests(user["username"]),
+    })
 
+REQUEST_STATUSES = ["Pending", "Approved", "Rejected", "Paid"]
+BULK_STATUS_MAX_ITEMS = 500
 
-    status_val = payload.get("status")
-    if status_val not in ["Pending", "Approved", "Rejected", "Paid"]:
-        raise HTTPException(status_code=400, detail="Invalid status value provided")
+def parse_request_identifier(request_id_or_oid: str) -> Dict[str, Any]:
+    # Build query to find the document by request_id (PRxxxx) or internal _id (ObjectId)
+    # Check if it matches the unique request ID format (e.g., PR0001, PR10000)
+    if re.match(r"PR\d{4,}$", request_id_or_oid):
+        return {"request_id": request_id_or_oid}
+    # Otherwise, assume it's an ObjectId
+    try:
+        return {"_id": ObjectId(request_id_or_oid)}
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid request identifier format")
 
-    update_doc = {"status": status_val}
-    current_time = datetime.now(timezone.utc) # Use timezone-aware time
+def build_status_update(doc: Dict[str, Any], status_val: str, current_time: datetime) -> Dict[str, Any]:
+    """The $set/$unset operation that moves `doc` to `status_val`."""
+    # status_changed_at also marks which write landed (see bulk_update_status)
+    update_doc = {"status": status_val, "status_changed_at": current_time}
     
     # --- Status Transition Logic ---
     if status_val == "Paid":
@@ -482,38 +974,463 @@ async def update_status(request_id_or_oid: str, payload: dict = Body(...), user:
     
     if unset_fields:
         update_operation["$unset"] = unset_fields
+    return update_operation
+
+def apply_status_update(before: Dict[str, Any], update_operation: Dict[str, Any]) -> Dict[str, Any]:
+    # Rebuild the post-update document locally rather than reading it back
+    after = {k: v for k, v in before.items() if k not in update_operation.get("$unset", {})}
+    after.update(update_operation["$set"])
+    return after
 
-    result = await requests_collection.update_one(query, update_operation)
+@app.patch("/admin/requests/{request_id_or_oid}")
+async def update_status(request_id_or_oid: str, payload: dict = Body(...), user: dict = Depends(get_current_user)):
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admins only")
+        
+    query = parse_request_identifier(request_id_or_oid)
+    
+    doc = await requests_collection.find_one(query)
+    if not doc:
+        raise HTTPException(status_code=404, detail="Request ID not found")
+
+
+    status_val = payload.get("status")
+    if status_val not in REQUEST_STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid status value provided")
+
+    current_time = datetime.now(timezone.utc) # Use timezone-aware time
+    update_operation = build_status_update(doc, status_val, current_time)
+
+    # Return the pre-update document so the summary counters move from the status
+    # that was actually replaced, even if another admin changed it in between
+    before = await requests_collection.find_one_and_update(
+        query, update_operation, return_document=ReturnDocument.BEFORE
+    )
     
-    if result.matched_count == 0:
+    if before is None:
         # This shouldn't happen if `doc` was found, but it's a safety check
         raise HTTPException(status_code=404, detail="Request ID not found during update")
+
+    if before.get("created_at") and before.get("type"):
+        await asyncio.gather(
+            move_request_summary(before["created_at"], before["type"], before.get("status"), status_val),
+            move_spend_rollups([(before, status_val)]),
+            bump_data_version(),
+        )
+    else:
+        await bump_data_version()
+
+    publish_request_event("status_changed", apply_status_update(before, update_operation), old_status=before.get("status"))
         
     return {"message": f"Status updated to {status_val}"}
 
+@app.post("/admin/requests/bulk_status")
+async def bulk_update_status(payload: dict = Body(...), user: dict = Depends(get_current_user)):
+    """
+    Apply one target status to many requests: one read of their current state, one
+    bulk_write with the same transition rules as update_status, one batched summary update.
+    Body: {"ids": ["PR0001", "<ObjectId>", ...], "status": "Paid"}. Returns per-item results.
+    """
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admins only")
+
+    status_val = payload.get("status")
+    if status_val not in REQUEST_STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid status value provided")
+    ids = payload.get("ids")
+    if not isinstance(ids, list) or not ids:
+        raise HTTPException(status_code=400, detail="ids must be a non-empty list")
+    if len(ids) > BULK_STATUS_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_STATUS_MAX_ITEMS} ids per request")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    queries: Dict[str, Dict[str, Any]] = {}
+    for item in ids:
+        item = str(item)
+        try:
+            queries[item] = parse_request_identifier(item)
+        except HTTPException as e:
+            results[item] = {"id": item, "ok": False, "error": e.detail}
+
+    request_ids = [q["request_id"] for q in queries.values() if "request_id" in q]
+    oids = [q["_id"] for q in queries.values() if "_id" in q]
+    docs = await requests_collection.find(
+        {"$or": [{"request_id": {"$in": request_ids}}, {"_id": {"$in": oids}}]}
+    ).to_list(None) if queries else []
+    by_request_id = {d.get("request_id"): d for d in docs}
+    by_oid = {d["_id"]: d for d in docs}
+
+    current_time = datetime.now(timezone.utc)
+    # Keyed by the resolved document, so "PR0001" and its ObjectId are one update, not two
+    planned: Dict[Any, Any] = {}
+    for item, query in queries.items():
+        doc = by_request_id.get(query["request_id"]) if "request_id" in query else by_oid.get(query["_id"])
+        if not doc:
+            results[item] = {"id": item, "ok": False, "error": "Request ID not found"}
+            continue
+        if doc["_id"] in planned:
+            results[item] = {"id": item, "ok": False, "error": f"Duplicate of {planned[doc['_id']][0]}"}
+            continue
+        planned[doc["_id"]] = (item, doc, build_status_update(doc, status_val, current_time))
+
+    if planned:
+        # Guard on the status we read, so a concurrent change is reported instead of overwritten
+        await requests_collection.bulk_write([
+            UpdateOne({"_id": doc["_id"], "status": doc.get("status")}, update_operation)
+            for _, doc, update_operation in planned.values()
+        ], ordered=False)
+        # bulk_write only reports totals; our own status_changed_at stamp shows which updates
+        # landed, even if a concurrent change set the same status
+        landed = {
+            d["_id"] for d in await requests_collection.find(
+                {"_id": {"$in": list(planned)}, "status_changed_at": current_time}, {"_id": 1}
+            ).to_list(None)
+        }
+        moves, rollup_moves = [], []
+        for item, doc, update_operation in planned.values():
+            if doc["_id"] not in landed:
+                results[item] = {"id": item, "ok": False, "error": "Request changed concurrently, please retry"}
+                continue
+            results[item] = {"id": item, "ok": True, "request_id": doc.get("request_id"), "status": status_val}
+            if doc.get("created_at") and doc.get("type"):
+                moves.append((doc["created_at"], doc["type"], doc.get("status"), status_val))
+                rollup_moves.append((doc, status_val))
+            publish_request_event("status_changed", apply_status_update(doc, update_operation), old_status=doc.get("status"))
+        await asyncio.gather(move_request_summaries(moves), move_spend_rollups(rollup_moves), bump_data_version())
+
+    ordered, seen = [], set()
+    for item in map(str, ids):
+        ordered.append({"id": item, "ok": False, "error": f"Duplicate of {item}"} if item in seen else results[item])
+        seen.add(item)
+    return {"updated": sum(1 for r in ordered if r["ok"]), "results": ordered}
+
+# --- Search Endpoint ---
+def encode_offset_cursor(offset: int) -> str:
+    raw = json.dumps({"o": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_offset_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = int(json.loads(base64.urlsafe_b64decode(padded.encode()))["o"])
+        if offset < 0:
+            raise ValueError(offset)
+        return offset
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+@app.get("/search_requests")
+async def search_requests(
+    user: dict = Depends(get_current_user),
+    q: Optional[str] = Query(None, description="Words to match in description, purpose or staff name"),
+    request_id: Optional[str] = Query(None, description="Request ID prefix, e.g. 'PR00'"),
+    staffName: Optional[str] = Query(None, description="Exact staff name (admins only)"),
+    type: Optional[str] = Query(None, description="Filter by type: 'reimbursement' or 'payment'"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    min_amount: Optional[float] = Query(None, ge=0),
+    max_amount: Optional[float] = Query(None, ge=0),
+    start: Optional[str] = Query(None, description="Inclusive created_at start date (YYYY-MM-DD)"),
+    end: Optional[str] = Query(None, description="Inclusive created_at end date (YYYY-MM-DD)"),
+    sort: str = Query("relevance", description="'relevance' (needs q) or 'date'"),
+    limit: int = Query(50, ge=1, le=PAGE_LIMIT_MAX),
+    cursor: Optional[str] = Query(None, description="Opaque 'next' token from the previous page"),
+):
+    """
+    Search over the text index (description, purpose, staffName) plus request_id prefix,
+    amount and date filters. Staff only ever see their own requests, as in /history_requests.
+    """
+    if sort not in ["relevance", "date"]:
+        raise HTTPException(status_code=400, detail="Invalid sort. Use 'relevance' or 'date'.")
+
+    query: Dict[str, Any] = {}
+    if user["role"] == "staff":
+        query["staffName"] = user["username"]
+    elif staffName:
+        query["staffName"] = staffName
+    if type in ["reimbursement", "payment"]:
+        query["type"] = type
+    if status:
+        if status not in REQUEST_STATUSES:
+            raise HTTPException(status_code=400, detail="Invalid status value provided")
+        query["status"] = status
+
+    # A bare request ID typed into the search box is treated as a prefix lookup
+    terms = (q or "").strip()
+    if not request_id and re.fullmatch(r"PR\d*", terms, re.IGNORECASE):
+        request_id, terms = terms, ""
+    if request_id:
+        # Anchored, case-sensitive prefix regex so the request_id index is used as a range scan
+        query["request_id"] = {"$regex": f"^{re.escape(request_id.upper())}"}
+    if terms:
+        query["$text"] = {"$search": terms}
+
+    if min_amount is not None or max_amount is not None:
+        amount_range = {}
+        if min_amount is not None:
+            amount_range["$gte"] = min_amount
+        if max_amount is not None:
+            amount_range["$lte"] = max_amount
+        query["amount"] = amount_range
+    date_range = date_range_filter(start, end)
+    if date_range:
+        query["created_at"] = date_range
+
+    include_archive = await archive_may_match(date_range)
+    if sort == "date" or not terms:
+        return await fetch_page(query, "created_at", limit, cursor, include_archive=include_archive)
+
+    # Relevance order has no stable key to seek on, so page by offset
+    offset = decode_offset_cursor(cursor) if cursor else 0
+    projection = {"score": {"$meta": "textScore"}}
+    text_sort = [("score", {"$meta": "textScore"}), ("_id", -1)]
+    if include_archive:
+        # Rank the leading rows of both collections together, then cut this page out
+        hot, cold = await asyncio.gather(*(
+            collection.find(query, projection).sort(text_sort).limit(offset + limit + 1).to_list(None)
+            for collection in (requests_collection, archive_collection)
+        ))
+        recs = merge_with_archive(hot, cold, key=lambda r: (r["score"], r["_id"]))[offset:offset + limit + 1]
+    else:
+        recs = await requests_collection.find(
+            query, projection
+        ).sort(text_sort).skip(offset).limit(limit + 1).to_list(limit + 1)
+    next_cursor = encode_offset_cursor(offset + limit) if len(recs) > limit else None
+    return {"items": [serialize_request(r) for r in recs[:limit]], "next": next_cursor}
+
+# --- Reporting Endpoints ---
+@app.get("/admin/reports/spend")
+async def spend_report(
+    user: dict = Depends(get_current_user),
+    months: int = Query(12, ge=1, le=120, description="How many months back, including the current one"),
+    status: str = Query("Paid", description="Status bucket to report on"),
+    type: Optional[str] = Query(None, description="Filter by type: 'reimbursement' or 'payment'"),
+    staffName: Optional[str] = Query(None, description="Limit to one staff member"),
+):
+    """Per-staff, per-month count and amount, read straight from the spend_rollups collection."""
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Admins only")
+    if status not in REQUEST_STATUSES:
+        raise HTTPException(status_code=400, detail="Invalid status value provided")
+
+    month_start = get_current_month_start()
+    first_month = (month_start.year * 12 + month_start.month - 1) - (months - 1)
+    since = f"{first_month // 12:04d}-{first_month % 12 + 1:02d}"
+
+    query: Dict[str, Any] = {"status": status, "month": {"$gte": since}}
+    if type in ["reimbursement", "payment"]:
+        query["type"] = type
+    if staffName:
+        query["staffName"] = staffName
+
+    rows = await rollups_collection.find(query, {"_id": 0}).sort([("month", 1), ("staffName", 1), ("type", 1)]).to_list(None)
+    rows = [{**r, "amount": round(r.get("amount", 0), 2)} for r in rows if r.get("count")]
+    return {"since": since, "status": status, "rows": rows}
+
 # --- History & Records Endpoints ---
 @app.get("/history_requests")
-async def get_history_requests(user: dict = Depends(get_current_user)):
+async def get_history_requests(
+    user: dict = Depends(get_current_user),
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_LIMIT_MAX, description="Page size; enables keyset pagination"),
+    cursor: Optional[str] = Query(None, description="Opaque 'next' token from the previous page"),
+):
     # Staff see all their requests (all time). Admin see all requests (all time).
     query = {}
     if user["role"] == "staff":
         query["staffName"] = user["username"]
+
+    # Paged clients get {"items": [...], "next": cursor}; old clients still get the full list
+    if limit is not None or cursor is not None:
+        return await fetch_page(query, "created_at", limit or PAGE_LIMIT_MAX, cursor, include_archive=True)
         
     # Sort by creation date descending
-    recs = await requests_collection.find(query).sort("created_at", -1).to_list(None)
-    recs = [serialize_doc(r) for r in recs]
+    recs = await find_all_with_archive(query, "created_at")
+    recs = [serialize_request(r) for r in recs]
     return JSONResponse(content=recs)
 
 @app.get("/admin/paid_records")
-async def get_admin_record(user: dict = Depends(get_current_user)):
+async def get_admin_record(
+    request: Request,
+    user: dict = Depends(get_current_user),
+    limit: Optional[int] = Query(None, ge=1, le=PAGE_LIMIT_MAX, description="Page size; enables keyset pagination"),
+    cursor: Optional[str] = Query(None, description="Opaque 'next' token from the previous page"),
+):
     if user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admins only")
         
     # Only records that have been paid (status: Paid)
     query = {"status": "Paid"}
-    recs = await requests_collection.find(query).sort("paid_date", -1).to_list(None)
-    recs = [serialize_doc(r) for r in recs]
-    return JSONResponse(content=recs)
+    if limit is not None or cursor is not None:
+        async def build():
+            return await fetch_page(query, "paid_date", limit or PAGE_LIMIT_MAX, cursor, include_archive=True)
+    else:
+        async def build():
+            return [serialize_request(r) for r in await find_all_with_archive(query, "paid_date")]
+    return await cached_json(request, ("paid_records", limit, cursor), build)
+
+# --- Export Endpoint ---
+# Columns streamed by /export_requests; also used as the server-side projection
+EXPORT_FIELDS = [
+    "request_id", "type", "staffName", "date", "description", "purpose", "amount",
+    "status", "created_at", "approved_date", "paid_date", "proof_filename",
+]
+EXPORT_BATCH_SIZE = 500
+# Spreadsheets evaluate cells starting with these as formulas; staff control the free-text fields
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+async def _next_or_none(cursor):
+    try:
+        return await cursor.__anext__()
+    except StopAsyncIteration:
+        return None
+
+async def export_rows(query: Dict[str, Any], sort_field: str, include_archive: bool = False):
+    def open_cursor(collection):
+        return collection.find(
+            query, {f: 1 for f in EXPORT_FIELDS}
+        ).sort([(sort_field, -1), ("_id", -1)]).batch_size(EXPORT_BATCH_SIZE)
+
+    # Rows are yielded as the driver receives each batch, so memory stays flat
+    if not include_archive:
+        async for doc in open_cursor(requests_collection):
+            yield serialize_doc(doc)
+        return
+    # Live and archived rows: merge the two sorted cursors row by row, still one batch each in memory
+    def key(doc):
+        return doc.get(sort_field) or datetime.min, doc["_id"]
+    hot, cold = open_cursor(requests_collection), open_cursor(archive_collection)
+    hot_doc, cold_doc = await _next_or_none(hot), await _next_or_none(cold)
+    while hot_doc or cold_doc:
+        # A request left in both collections by an interrupted archive run has the same key in
+        # each (the sort dates of a Paid request do not change), so the copies meet here
+        if hot_doc is not None and cold_doc is not None and hot_doc["_id"] == cold_doc["_id"]:
+            cold_doc = await _next_or_none(cold)
+            continue
+        if cold_doc is None or (hot_doc is not None and key(hot_doc) >= key(cold_doc)):
+            yield serialize_doc(hot_doc)
+            hot_doc = await _next_or_none(hot)
+        else:
+            yield serialize_doc(cold_doc)
+            cold_doc = await _next_or_none(cold)
+
+def csv_safe(row: Dict[str, Any]) -> Dict[str, Any]:
+    # Quote formula-like text with a leading apostrophe so it is shown, not executed
+    return {
+        k: f"'{v}" if isinstance(v, str) and v.startswith(CSV_FORMULA_PREFIXES) else v
+        for k, v in row.items()
+    }
+
+async def stream_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue()
+    async for row in rows:
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerow(csv_safe(row))
+        yield buffer.getvalue()
+
+async def stream_ndjson(rows):
+    async for row in rows:
+        row.pop("_id", None)
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+@app.get("/export_requests")
+async def export_requests(
+    user: dict = Depends(get_current_user),
+    format: str = Query("csv", description="'csv' or 'ndjson'"),
+    start: Optional[str] = Query(None, description="Inclusive start date (YYYY-MM-DD)"),
+    end: Optional[str] = Query(None, description="Inclusive end date (YYYY-MM-DD)"),
+    date_field: str = Query("created_at", description="Date the range applies to: 'created_at' or 'paid_date'"),
+    type: Optional[str] = Query(None, description="Filter by type: 'reimbursement' or 'payment'"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+):
+    if format not in ["csv", "ndjson"]:
+        raise HTTPException(status_code=400, detail="Invalid format. Use 'csv' or 'ndjson'.")
+    if date_field not in ["created_at", "paid_date"]:
+        raise HTTPException(status_code=400, detail="Invalid date_field. Use 'created_at' or 'paid_date'.")
+
+    # Same visibility as /history_requests: staff export only their own requests
+    query: Dict[str, Any] = {}
+    if user["role"] == "staff":
+        query["staffName"] = user["username"]
+    if type in ["reimbursement", "payment"]:
+        query["type"] = type
+    if status:
+        if status not in REQUEST_STATUSES:
+            raise HTTPException(status_code=400, detail="Invalid status value provided")
+        query["status"] = status
+
+    if date_field == "paid_date" and not status:
+        # Only Paid requests carry a paid_date; saying so lets the Paid-only index serve the sort
+        query["status"] = "Paid"
+
+    date_range = date_range_filter(start, end)
+    if date_range:
+        query[date_field] = date_range
+
+    rows = export_rows(query, date_field, include_archive=await archive_may_match(date_range))
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
+    if format == "csv":
+        body, media_type = stream_csv(rows), "text/csv; charset=utf-8"
+    else:
+        body, media_type = stream_ndjson(rows), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="requests_{stamp}.{format}"'},
+    )
+
+# --- Live Updates (Server-Sent Events) ---
+@app.get("/events")
+async def events_stream(request: Request):
+    # EventSource cannot send headers, so accept the token as a query parameter too
+    auth_header = request.headers.get("Authorization", "")
+    token = auth_header.replace("Bearer ", "").strip() or request.query_params.get("token")
+    if not token:
+        raise HTTPException(status_code=401, detail="Authentication required (Token missing)")
+    user = await get_current_user(token=token)
+
+    sub = hub.subscribe(user["username"], user["role"])
+    return StreamingResponse(
+        sse_stream(sub, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# --- Metrics ---
+# Application state sampled at scrape time, next to the HTTP/MongoDB series in metrics.py
+def _caches():
+    return {"users": user_cache, "tokens": token_cache, "attachments": attachment_cache, "responses": response_cache}
+
+def _cache_samples(field: str):
+    return lambda: {(name,): getattr(cache, field) for name, cache in _caches().items()}
+
+registry.register(Gauge("app_cache_hits", "Cache hits since start", ("cache",), collect=_cache_samples("hits")))
+registry.register(Gauge("app_cache_misses", "Cache misses since start", ("cache",), collect=_cache_samples("misses")))
+registry.register(Gauge("app_cache_entries", "Entries currently cached", ("cache",), collect=lambda: {
+    (name,): len(cache) for name, cache in _caches().items()}))
+registry.register(Gauge("app_password_pool", "bcrypt worker pool state", ("state",), collect=lambda: {
+    ("queued",): password_stats["queued"], ("running",): password_stats["running"]}))
+registry.register(Gauge("app_password_queue_wait_seconds_total", "Total bcrypt queue wait", (), collect=lambda: {
+    (): password_stats["wait_total_ms"] / 1000}))
+registry.register(Gauge("app_startup_seconds", "Time from module load to ready, and per startup phase", ("phase",),
+    collect=lambda: {
+        ("ready",): app.state.startup["ready_seconds"],
+        **{(name,): seconds for name, seconds in app.state.startup["phases"].items()},
+    } if getattr(app.state, "startup", None) else {}))
+registry.register(Gauge("app_event_subscribers", "Connected /events streams", (), collect=lambda: {
+    (): len(hub.subscribers)}))
+registry.register(Gauge("app_event_stream_errors", "Change stream failures since start (reopened with resume)", (), collect=lambda: {
+    (): hub.stream_errors}))
+
+@app.get("/metrics")
+async def metrics_endpoint(request: Request):
+    if METRICS_TOKEN:
+        auth_header = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(auth_header.replace("Bearer ", "").strip(), METRICS_TOKEN):
+            raise HTTPException(status_code=401, detail="Metrics token required")
+    return Response(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 # --- Logout Endpoint (Optional, as token is self-contained) ---
 @app.post("/logout")
@@ -522,9 +1439,37 @@ async def logout():
     return {"message": "Logged out successfully"}
 
 # === Serve Attachments with Authorization (FIXED for Header and Query Param) ===
-@app.get("/attachments/{filename}")
-async def get_attachment(filename: str, request: Request):
-    
+ATTACHMENT_MAX_AGE = int(os.getenv("ATTACHMENT_MAX_AGE", "3600"))
+# proof_filename -> owner and blob; these fields never change once a request is stored
+attachment_cache = TTLCache(maxsize=4096, ttl=300)
+
+async def get_attachment_record(filename: str) -> Optional[Dict[str, Any]]:
+    doc = attachment_cache.get(filename)
+    if doc is None:
+        projection = {"staffName": 1, "proof_filename": 1, "proof_blob": 1}
+        doc = await requests_collection.find_one({"proof_filename": filename}, projection)
+        if doc is None:
+            # Proofs of archived requests stay reachable through token links
+            doc = await archive_collection.find_one({"proof_filename": filename}, projection)
+        if doc:
+            attachment_cache.set(filename, doc)
+    return doc
+
+def attachment_etag(doc: Dict[str, Any], file_path: str) -> str:
+    # Blobs are content-addressed, so the hash is a strong validator by itself
+    if doc.get("proof_blob"):
+        suffix = os.path.basename(file_path)[len(doc["proof_blob"]):]
+        return f'"{doc["proof_blob"]}{suffix}"'
+    st = os.stat(file_path)
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+async def authorize_attachment_by_token(filename: str, request: Request) -> Dict[str, Any]:
     # 1. Get Token from Header or Query Parameter
     auth_header = request.headers.get("Authorization", "")
     token = auth_header.replace("Bearer ", "").strip()
@@ -548,8 +1493,8 @@ async def get_attachment(filename: str, request: Request):
             raise HTTPException(status_code=403, detail="Invalid or expired token, or role mismatch.")
         raise 
 
-    # 3. Find the Document in DB
-    doc = await requests_collection.find_one({"proof_filename": filename})
+    # 3. Find the Document in DB (indexed on proof_filename, and cached since it never changes)
+    doc = await get_attachment_record(filename)
     if not doc:
         raise HTTPException(status_code=404, detail="Attachment record not found in database")
         
@@ -557,17 +1502,58 @@ async def get_attachment(filename: str, request: Request):
     if user["role"] != "admin" and doc["staffName"] != user["username"]:
         raise HTTPException(status_code=403, detail="Not authorized to view this attachment (Not owner or Admin)")
         
-    # 5. Serve File
-    file_path = os.path.join(upload_path, filename)
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="File missing on server storage")
+    return doc
+
+@app.get("/attachments/{filename}")
+async def get_attachment(
+    filename: str,
+    request: Request,
+    variant: str = Query("original", description="'original', 'thumb' or 'preview' (image proofs only)"),
+):
+    if variant not in ["original", "thumb", "preview"]:
+        raise HTTPException(status_code=400, detail="Invalid variant. Use 'original', 'thumb' or 'preview'.")
+    
+    # Signed links from the list endpoints: signature and expiry are the whole authorization check
+    sig = request.query_params.get("sig")
+    if sig:
+        blob = request.query_params.get("b", "")
+        if not verify_attachment_signature(filename, blob, request.query_params.get("exp", ""), sig):
+            raise HTTPException(status_code=403, detail="Invalid or expired attachment link")
+        doc = {"proof_filename": filename, "proof_blob": blob or None}
+    else:
+        doc = await authorize_attachment_by_token(filename, request)
         
-    # Determine MIME type for the browser
+    # 5. Serve File (content-addressed blob, or the legacy flat file for unmigrated uploads)
+    file_path = blob_store.resolve(doc)
+    if not file_path or not os.path.exists(file_path):
+        raise HTTPException(status_code=404, detail="File missing on server storage")
+
+    # Determine MIME type for the browser (blobs have no extension, so go by the filename)
     content_type = "application/pdf"
-    if file_path.lower().endswith((".jpg", ".jpeg")):
+    if filename.lower().endswith((".jpg", ".jpeg")):
         content_type = "image/jpeg"
-    elif file_path.lower().endswith(".png"):
+    elif filename.lower().endswith(".png"):
         content_type = "image/png"
+    cache_control = f"private, max-age={ATTACHMENT_MAX_AGE}"
         
-    # Serve as preview (inline), not forced download
-    return FileResponse(file_path, media_type=content_type, filename=filename)
\ No newline at end of file
+    # Serve a smaller rendition when one is ready; until then fall back to the original
+    if variant != "original" and doc.get("proof_blob"):
+        variant_path = blob_store.variant_path(doc["proof_blob"], variant)
+        if os.path.exists(variant_path):
+            file_path, content_type = variant_path, "image/jpeg"
+        else:
+            # Covers proofs migrated from the flat directory, which were never rendered
+            schedule_proof_variants(doc)
+            # Make the browser come back for the real variant once it is ready
+            cache_control = "private, no-cache"
+
+    etag = attachment_etag(doc, file_path)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    # Serve as preview (inline), not forced download; FileResponse also answers Range requests
+    return FileResponse(
+        file_path, media_type=content_type, filename=filename,
+        headers=headers, content_disposition_type="inline",
+    )
@@ -0,0 +1,59 @@
+# backend/migrate_uploads.py
+# Moves legacy flat uploads ({username}_{timestamp}_{name}) into the content-addressed blob store.
+# Covers live and archived requests. Safe to re-run: requests that already have proof_blob are skipped.
+import asyncio
+import hashlib
+import os
+
+from db import archive_collection, requests_collection
+from blobstore import blob_store
+from uploads import remove_quietly, upload_path
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def copy_into_store(path: str, sha256: str):
+    target = blob_store.path_for(sha256)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if not os.path.exists(target):
+        tmp = target + ".part"
+        with open(path, "rb") as src, open(tmp, "wb") as dst:
+            for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                dst.write(chunk)
+        os.replace(tmp, target)
+
+async def main():
+    hashed = {}  # legacy filename -> sha256, since old filenames could be shared by several requests
+    migrated, missing = 0, 0
+    query = {"proof_filename": {"$exists": True, "$ne": None}, "proof_blob": {"$exists": False}}
+    for collection in (requests_collection, archive_collection):
+        async for doc in collection.find(query, {"proof_filename": 1}):
+            filename = doc["proof_filename"]
+            path = os.path.join(upload_path, filename)
+            if filename not in hashed:
+                if not os.path.exists(path):
+                    print(f"⚠️ Missing file for {doc['_id']}: {filename}")
+                    missing += 1
+                    continue
+                sha256 = await asyncio.to_thread(hash_file, path)
+                await asyncio.to_thread(copy_into_store, path, sha256)
+                hashed[filename] = sha256
+            sha256 = hashed[filename]
+            size = os.path.getsize(blob_store.path_for(sha256))
+            await collection.update_one(
+                {"_id": doc["_id"]}, {"$set": {"proof_blob": sha256, "proof_size": size}}
+            )
+            await blob_store.add_ref(sha256, size)
+            migrated += 1
+
+    # Flat copies are removed only once every request pointing at them has been moved
+    for filename in hashed:
+        remove_quietly(os.path.join(upload_path, filename))
+    print(f"✅ Migrated {migrated} request(s) into {len(hashed)} blob(s); {missing} missing file(s)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
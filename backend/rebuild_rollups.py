@@ -0,0 +1,8 @@
+import asyncio
+from db import recompute_spend_rollups
+
+async def main():
+    await recompute_spend_rollups()
+
+if __name__ == "__main__":
+    asyncio.run(main())
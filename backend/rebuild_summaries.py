@@ -0,0 +1,8 @@
+import asyncio
+from db import recompute_request_summaries
+
+async def main():
+    await recompute_request_summaries()
+
+if __name__ == "__main__":
+    asyncio.run(main())
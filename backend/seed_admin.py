@@ -3,7 +3,7 @@ import asyncio
 from datetime import datetime, timezone
 from passlib.context import CryptContext
 # ត្រូវប្រាកដថា db.py របស់អ្នកកំណត់ users_collection ត្រឹមត្រូវ
-from db import users_collection 
+from db import bump_users_version, users_collection
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -24,6 +24,8 @@ async def seed_admin():
         "role": "admin",
         "created_at": datetime.now(timezone.utc)
     })
+    # Running workers drop their cached copies of the deleted admins
+    await bump_users_version()
     print(f"✅ Fresh admin created: {admin_user} / {admin_pass}")
 
 if __name__ == "__main__":
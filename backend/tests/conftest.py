@@ -0,0 +1,62 @@
+# backend/tests/conftest.py
+# In-process app against mongomock: run from backend/ with `python -m pytest tests`.
+import os
+import sys
+import tempfile
+
+import pytest
+
+pytest.importorskip("mongomock_motor")
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test")
+os.environ.setdefault("UPLOAD_PATH", tempfile.mkdtemp(prefix="uploads-"))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from mongomock.collection import BulkOperationBuilder  # noqa: E402
+from mongomock_motor import AsyncMongoMockClient  # noqa: E402
+
+
+def _ignore_sort(method):
+    return lambda self, *args, sort=None, **kwargs: method(self, *args, **kwargs)
+
+
+# pymongo >= 4.11 passes sort= to bulk updates and replaces, which mongomock does not accept yet
+BulkOperationBuilder.add_update = _ignore_sort(BulkOperationBuilder.add_update)
+BulkOperationBuilder.add_replace = _ignore_sort(BulkOperationBuilder.add_replace)
+
+import db  # noqa: E402
+
+# Swap every collection for an in-memory one before main.py imports them
+db.client = AsyncMongoMockClient()
+db.db = db.client[os.environ["DB_NAME"]]
+for _name in [n for n in dir(db) if n.endswith("_collection")]:
+    setattr(db, _name, db.db[getattr(db, _name).name])
+
+import main  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+PDF = b"%PDF-1.4\n%%EOF\n"
+
+
+def auth(tc, username, password):
+    res = tc.post("/token", data={"username": username, "password": password})
+    assert res.status_code == 200, res.text
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def tc():
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def admin(tc):
+    return auth(tc, "nou", os.getenv("ADMIN_PASS", "nou123"))
+
+
+@pytest.fixture(scope="session")
+def staff(tc, admin):
+    tc.post("/create_user", data={"username": "alice", "password": "alice123", "role": "staff"}, headers=admin)
+    return auth(tc, "alice", "alice123")
@@ -0,0 +1,34 @@
+# backend/tests/test_archive_duplicates.py
+# An interrupted archive run leaves a request in both collections; readers must list it once.
+import json
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+import db
+from conftest import PDF
+
+
+def test_request_in_both_collections_is_listed_once(tc, admin, staff):
+    res = tc.post(
+        "/submit_payment",
+        data={"date": "2026-01-01", "purpose": "hotel", "amount": "30"},
+        files={"proof": ("receipt.pdf", PDF, "application/pdf")},
+        headers=staff,
+    )
+    doc = tc.portal.call(db.requests_collection.find_one, {"request_id": res.json()["request_id"]})
+    tc.portal.call(db.archive_collection.insert_one, dict(doc))
+    cutoff = {"$set": {"cutoff": datetime.now(timezone.utc) + timedelta(days=1)}}
+    tc.portal.call(partial(db.counters_collection.update_one, {"_id": "archive"}, cutoff, upsert=True))
+    try:
+        ids = [r["_id"] for r in tc.get("/history_requests", headers=admin).json()]
+        assert ids.count(str(doc["_id"])) == 1
+
+        ids = [r["_id"] for r in tc.get("/history_requests", params={"limit": 100}, headers=admin).json()["items"]]
+        assert ids.count(str(doc["_id"])) == 1
+
+        res = tc.get("/export_requests", params={"format": "ndjson"}, headers=admin)
+        rows = [json.loads(line) for line in res.text.splitlines()]
+        assert [r["request_id"] for r in rows].count(doc["request_id"]) == 1
+    finally:
+        tc.portal.call(db.archive_collection.delete_many, {})
+        tc.portal.call(db.counters_collection.delete_one, {"_id": "archive"})
@@ -0,0 +1,22 @@
+# backend/tests/test_export_csv.py
+import csv
+import io
+
+from conftest import PDF
+
+
+def test_csv_export_neutralises_formulas(tc, admin, staff):
+    res = tc.post(
+        "/submit_reimbursement",
+        data={"date": "2026-01-02", "description": "=HYPERLINK(\"http://x\")", "amount": "12"},
+        files={"proof": ("receipt.pdf", PDF, "application/pdf")},
+        headers=staff,
+    )
+    assert res.status_code == 200, res.text
+    request_id = res.json()["request_id"]
+
+    res = tc.get("/export_requests", params={"format": "csv"}, headers=admin)
+    assert res.status_code == 200
+    rows = {r["request_id"]: r for r in csv.DictReader(io.StringIO(res.text))}
+    assert rows[request_id]["description"] == "'=HYPERLINK(\"http://x\")"
+    assert rows[request_id]["amount"] == "12.0"
@@ -0,0 +1,58 @@
+# backend/tests/test_status_serialization.py
+# Every list endpoint must still serialize requests after a status change, whatever date
+# fields the update added.
+import json
+
+from conftest import PDF
+from events import format_sse, hub
+
+LIST_ENDPOINTS = [
+    ("staff", "/my_requests", {}),
+    ("staff", "/history_requests", {}),
+    ("staff", "/history_requests", {"limit": 10}),
+    ("staff", "/dashboard", {}),
+    ("admin", "/admin/requests", {}),
+    ("admin", "/history_requests", {}),
+    ("admin", "/admin/paid_records", {}),
+    ("admin", "/admin/paid_records", {"limit": 10}),
+    ("admin", "/dashboard", {}),
+    ("admin", "/search_requests", {"request_id": "PR"}),
+    ("admin", "/export_requests", {"format": "ndjson"}),
+]
+
+
+def submit(tc, staff) -> str:
+    res = tc.post(
+        "/submit_payment",
+        data={"date": "2026-01-01", "purpose": "taxi", "amount": "10"},
+        files={"proof": ("receipt.pdf", PDF, "application/pdf")},
+        headers=staff,
+    )
+    assert res.status_code == 200, res.text
+    return res.json()["request_id"]
+
+
+def test_lists_serialize_after_status_changes(tc, admin, staff):
+    headers = {"admin": admin, "staff": staff}
+    sub = hub.subscribe("nou", "admin")
+    try:
+        approved, paid = submit(tc, staff), submit(tc, staff)
+        assert tc.patch(f"/admin/requests/{approved}", json={"status": "Approved"}, headers=admin).status_code == 200
+        res = tc.post("/admin/requests/bulk_status", json={"ids": [paid], "status": "Paid"}, headers=admin)
+        assert res.json()["updated"] == 1
+
+        for role, path, params in LIST_ENDPOINTS:
+            res = tc.get(path, params=params, headers=headers[role])
+            assert res.status_code == 200, f"{role} {path} {params}: {res.text}"
+
+        # Live events carry the same serialized documents
+        frames = []
+        while not sub.queue.empty():
+            item = sub.queue.get_nowait()
+            frames.append(format_sse(item["event"], item["data"]))
+        changed = [f for f in frames if f.startswith("event: status_changed")]
+        assert len(changed) == 2
+        data = json.loads(changed[-1].split("data: ", 1)[1])
+        assert data["request"]["status_changed_at"]
+    finally:
+        hub.unsubscribe(sub)
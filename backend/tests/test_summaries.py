@@ -0,0 +1,57 @@
+# backend/tests/test_summaries.py
+from functools import partial
+
+import db
+from conftest import PDF
+from main import get_current_month_start, month_key
+
+
+def test_pending_summary_never_negative(tc, admin):
+    month = month_key(get_current_month_start())
+    tc.portal.call(partial(
+        db.summaries_collection.update_one, {"_id": month}, {"$set": {"counts.payment.Pending": -3}}, upsert=True
+    ))
+    try:
+        res = tc.get("/admin/pending_summary", headers=admin)
+        assert res.status_code == 200
+        assert res.json()["payment_pending"] == 0
+    finally:
+        tc.portal.call(db.recompute_request_summaries)
+
+
+def test_recompute_summaries_replaces_months_in_place(tc, admin):
+    tc.portal.call(db.summaries_collection.insert_one, {"_id": "1999-01", "counts": {"payment": {"Paid": 7}}})
+    month = month_key(get_current_month_start())
+    tc.portal.call(partial(
+        db.summaries_collection.update_one, {"_id": month}, {"$set": {"counts.payment.Pending": 999}}, upsert=True
+    ))
+
+    tc.portal.call(db.recompute_request_summaries)
+
+    assert tc.portal.call(db.summaries_collection.find_one, {"_id": "1999-01"}) is None
+    counts = tc.portal.call(db.get_request_summary, get_current_month_start())
+    pending = tc.portal.call(db.requests_collection.count_documents, {"type": "payment", "status": "Pending"})
+    assert counts.get("payment", {}).get("Pending", 0) == pending
+
+
+def test_recompute_rollups_replaces_buckets_in_place(tc, admin, staff):
+    res = tc.post(
+        "/submit_payment",
+        data={"date": "2026-01-01", "purpose": "fuel", "amount": "20"},
+        files={"proof": ("receipt.pdf", PDF, "application/pdf")},
+        headers=staff,
+    )
+    assert res.status_code == 200, res.text
+    month = month_key(get_current_month_start())
+    bucket = {"month": month, "staffName": "alice", "type": "payment", "status": "Pending"}
+    tc.portal.call(partial(db.rollups_collection.update_one, bucket, {"$set": {"count": 999}}, upsert=True))
+    tc.portal.call(db.rollups_collection.insert_one, {**bucket, "month": "1999-01", "count": 1, "amount": 5})
+    before = tc.portal.call(db.rollups_collection.find_one, bucket)
+
+    tc.portal.call(db.recompute_spend_rollups)
+
+    assert tc.portal.call(db.rollups_collection.find_one, {**bucket, "month": "1999-01"}) is None
+    after = tc.portal.call(db.rollups_collection.find_one, bucket)
+    expected = tc.portal.call(db.requests_collection.count_documents, {"staffName": "alice", "type": "payment", "status": "Pending"})
+    assert after["_id"] == before["_id"]
+    assert after["count"] == expected
@@ -0,0 +1,106 @@
+# backend/thumbnails.py
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Set
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it proofs are always served as uploaded
+    Image = None
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png"}
+THUMBNAIL_WORKERS = int(os.getenv("THUMBNAIL_WORKERS", "2"))
+THUMBNAIL_MAX_DIM = int(os.getenv("THUMBNAIL_MAX_DIM", "320"))
+# Longest side of the recompressed "preview" copy; 0 disables it
+PREVIEW_MAX_DIM = int(os.getenv("PREVIEW_MAX_DIM", "1600"))
+PREVIEW_QUALITY = int(os.getenv("PREVIEW_QUALITY", "80"))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_in_flight: Set[str] = set()
+
+
+def enabled() -> bool:
+    return Image is not None
+
+
+def _save_jpeg(img, max_dim: int, quality: int, dest: str):
+    img = img.copy()
+    img.thumbnail((max_dim, max_dim))
+    if img.mode not in ("RGB", "L"):
+        # Flatten transparency onto white, JPEG has no alpha channel
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.convert("RGBA").split()[-1])
+        img = background
+    tmp = dest + ".part"
+    img.save(tmp, "JPEG", quality=quality, optimize=True)
+    os.replace(tmp, dest)
+
+
+def render_variants(src: str, thumb_dest: str, preview_dest: str):
+    """Runs in a worker process: write the thumbnail and, if it saves space, the preview copy."""
+    with Image.open(src) as img:
+        img = ImageOps.exif_transpose(img)
+        _save_jpeg(img, THUMBNAIL_MAX_DIM, 75, thumb_dest)
+        if PREVIEW_MAX_DIM > 0:
+            _save_jpeg(img, PREVIEW_MAX_DIM, PREVIEW_QUALITY, preview_dest)
+            # Keep the original as the preview when recompressing did not make it smaller
+            if os.path.getsize(preview_dest) >= os.path.getsize(src):
+                os.remove(preview_dest)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn, not fork: the parent has a running event loop and driver threads
+        _executor = ProcessPoolExecutor(
+            max_workers=THUMBNAIL_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+def _discard_executor(executor: ProcessPoolExecutor):
+    """Drop a pool whose worker died; the next schedule_variants() starts a fresh one."""
+    global _executor
+    if _executor is executor:
+        _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def schedule_variants(src: str, filename: str, thumb_dest: str, preview_dest: str):
+    """Queue variant generation for an image proof without waiting for it. Safe to call repeatedly.
+    Never raises: variants are an optimisation, the proof itself is already stored."""
+    if not enabled() or os.path.splitext(filename)[1].lower() not in IMAGE_EXTS:
+        return
+    if src in _in_flight or os.path.exists(thumb_dest):
+        return
+    try:
+        executor = _get_executor()
+        future = asyncio.get_running_loop().run_in_executor(
+            executor, render_variants, src, thumb_dest, preview_dest
+        )
+    except BrokenProcessPool as e:
+        print(f"⚠️ Thumbnail workers died, restarting them on the next upload: {e}")
+        _discard_executor(executor)
+        return
+    except Exception as e:
+        print(f"⚠️ Could not queue thumbnail generation for {filename}: {e}")
+        return
+    _in_flight.add(src)
+
+    def _done(fut):
+        _in_flight.discard(src)
+        if fut.cancelled() or fut.exception() is None:
+            return
+        print(f"⚠️ Thumbnail generation failed for {filename}: {fut.exception()}")
+        if isinstance(fut.exception(), BrokenProcessPool):
+            _discard_executor(executor)
+
+    future.add_done_callback(_done)
+
+
+def shutdown():
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
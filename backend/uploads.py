@@ -0,0 +1,86 @@
+# backend/uploads.py
+import hashlib
+import os
+import tempfile
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+# Use environment variable for upload path, fallback to a local folder in project root
+project_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+upload_path = os.getenv("UPLOAD_PATH", os.path.join(project_root, "uploads"))
+os.makedirs(upload_path, exist_ok=True)
+
+ALLOWED_EXTS = {".pdf", ".jpg", ".jpeg", ".png"}
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+
+def validate_extension(filename: str) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    if ext not in ALLOWED_EXTS:
+        raise HTTPException(status_code=400, detail=f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTS)}")
+    return ext
+
+
+def too_large() -> HTTPException:
+    limit_mb = UPLOAD_MAX_BYTES / (1024 * 1024)
+    return HTTPException(status_code=413, detail=f"File too large. Maximum size is {limit_mb:g} MB.")
+
+
+class StagedUpload:
+    """
+    An uploaded file written to a temp file under upload_path.
+    Nothing is visible to readers until the blob store moves it into place, so a failed
+    DB insert only has to discard() the temp file.
+    """
+
+    def __init__(self, temp_path: str, sha256: str, size: int):
+        self.temp_path = temp_path
+        self.sha256 = sha256
+        self.size = size
+
+    async def discard(self):
+        await run_in_threadpool(remove_quietly, self.temp_path)
+
+
+def remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def stage_upload(upload: UploadFile, dest_dir: str = upload_path) -> StagedUpload:
+    """
+    Stream an UploadFile to a temp file in dest_dir in chunks, hashing as it goes.
+    All disk I/O runs in the threadpool so the event loop is never blocked, and the
+    size limit is enforced before (when the size is known) and while copying.
+    """
+    if upload.size is not None and upload.size > UPLOAD_MAX_BYTES:
+        raise too_large()
+
+    fd, temp_path = await run_in_threadpool(tempfile.mkstemp, dir=dest_dir, prefix=".upload-", suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > UPLOAD_MAX_BYTES:
+                    raise too_large()
+                digest.update(chunk)
+                await run_in_threadpool(buffer.write, chunk)
+    except HTTPException:
+        await run_in_threadpool(remove_quietly, temp_path)
+        raise
+    except Exception as e:
+        await run_in_threadpool(remove_quietly, temp_path)
+        raise HTTPException(status_code=500, detail=f"File upload failed on server: {str(e)}")
+    finally:
+        await upload.close()
+
+    return StagedUpload(temp_path, digest.hexdigest(), size)
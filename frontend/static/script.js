@@ -4,6 +4,9 @@ function delay(ms) { return new Promise(resolve => setTimeout(resolve, ms)); }
 // ---------- State ----------
 let token = null;
 let currentRole = null;
+let eventSource = null;
+let dashboardCache = null; // { at, data } from /dashboard, reused by the first loads after login
+const DASHBOARD_MAX_AGE_MS = 15000;
 
 // ---------- Helpers (Show/Hide Section) ----------
 function showSection(id) {
@@ -22,6 +25,30 @@ function showSection(id) {
 function authHeaders() { return token ? { "Authorization": `Bearer ${token}` } : {}; }
 function handleUnauthorized(res) { if (res.status === 401) { logout(); return true; } return false; }
 
+// ---------- Dashboard bootstrap ----------
+// One /dashboard call after login replaces the separate list/summary fetches; each loader
+// below takes its part from it while fresh and falls back to its own endpoint afterwards.
+async function loadDashboard() {
+    dashboardCache = null;
+    try {
+        const res = await fetch("/dashboard", { headers: authHeaders() });
+        if (handleUnauthorized(res) || !res.ok) return;
+        dashboardCache = { at: Date.now(), data: await res.json() };
+    } catch {}
+}
+function dashboardPart(key) {
+    if (!dashboardCache || Date.now() - dashboardCache.at > DASHBOARD_MAX_AGE_MS) return null;
+    return dashboardCache.data[key] ?? null;
+}
+function invalidateDashboard() { dashboardCache = null; }
+async function fetchJSON(url) {
+    const res = await fetch(url, { headers: authHeaders() });
+    if (handleUnauthorized(res)) return null;
+    if (!res.ok) throw new Error(`Request failed with status ${res.status}`);
+    return res.json();
+}
+async function fetchMyRequests() { return dashboardPart("my_requests") ?? fetchJSON("/my_requests"); }
+
 // --- FIXED: proofLink now includes the token as a query parameter ---
 function proofLink(r) {
     if (r.proof_full_url) return r.proof_full_url;
@@ -188,6 +215,7 @@ document.getElementById("loginForm")?.addEventListener("submit", async (e) => {
         document.getElementById("paymentBtn").style.display = isAdmin ? "none" : "inline-block";
         document.getElementById("mainMenu").classList.remove("is-hidden");
         showSection("home");
+        await loadDashboard();
         if (isAdmin) {
             setAdminHomeUI();
             loadPendingRequestsSummary();
@@ -195,13 +223,15 @@ document.getElementById("loginForm")?.addEventListener("submit", async (e) => {
             setStaffHomeUI();
             loadStaffPendingRequests();
         }
+        connectEvents();
     } catch (error) {
         if (msg) msg.textContent = "Login failed due to server error.";
     }
 });
 document.getElementById("logoutBtn")?.addEventListener("click", logout);
 function logout() {
-    token = null; currentRole = null;
+    if (eventSource) { eventSource.close(); eventSource = null; }
+    token = null; currentRole = null; invalidateDashboard();
     ["logoutBtn","adminMenuBtn","recordMenuBtn","adminReviewBtn","historyMenuBtn","reimbursementBtn","paymentBtn"].forEach(id => {
         const el = document.getElementById(id);
         if (el) el.style.display = "none";
@@ -221,6 +251,7 @@ document.getElementById("reimbursementForm")?.addEventListener("submit", async (
         if (handleUnauthorized(res)) return;
         if (!res.ok) throw new Error("Submit failed");
         await res.json();
+        invalidateDashboard();
         e.target.reset();
         alert("Reimbursement submitted successfully!");
         await loadMyRequests();
@@ -239,6 +270,7 @@ document.getElementById("paymentForm")?.addEventListener("submit", async (e) =>
         if (handleUnauthorized(res)) return;
         if (!res.ok) throw new Error("Submit failed");
         await res.json();
+        invalidateDashboard();
         e.target.reset();
         alert("Payment Request submitted successfully!");
         await loadMyPaymentRequests();
@@ -255,9 +287,8 @@ async function loadMyRequests() {
     const tbody = document.querySelector("#recordsTable tbody");
     tbody.innerHTML = "<tr><td colspan='9'>Loading...</td></tr>";
     try {
-        const res = await fetch("/my_requests", { headers: authHeaders() });
-        if (handleUnauthorized(res)) return;
-        const data = await res.json();
+        const data = await fetchMyRequests();
+        if (!data) return;
         const reimbursements = data.filter(r => r.type === "reimbursement");
         tbody.innerHTML = "";
         if (!reimbursements.length) {
@@ -273,9 +304,8 @@ async function loadMyPaymentRequests() {
     const tbody = document.querySelector("#paymentsTable tbody");
     tbody.innerHTML = "<tr><td colspan='9'>Loading...</td></tr>";
     try {
-        const res = await fetch("/my_requests", { headers: authHeaders() });
-        if (handleUnauthorized(res)) return;
-        const data = await res.json();
+        const data = await fetchMyRequests();
+        if (!data) return;
         const payments = data.filter(r => r.type === "payment");
         tbody.innerHTML = "";
         if (!payments.length) {
@@ -296,9 +326,8 @@ async function loadStaffPendingRequests() {
     rTbody.innerHTML = '<tr><td colspan="9">Loading...</td></tr>';
     pTbody.innerHTML = '<tr><td colspan="9">Loading...</td></tr>';
     try {
-        const res = await fetch("/my_requests", { headers: authHeaders() });
-        if (handleUnauthorized(res)) return;
-        const data = await res.json();
+        const data = await fetchMyRequests();
+        if (!data) return;
         const pendingReimbursements = data.filter(r => r.type === "reimbursement" && r.status === "Pending");
         const pendingPayments = data.filter(r => r.type === "payment" && r.status === "Pending");
         rTbody.innerHTML = "";
@@ -320,9 +349,8 @@ async function loadPendingRequestsSummary() {
     if (adminPendingReviewContainer) adminPendingReviewContainer.style.display = 'none';
     if (currentRole !== 'admin') return;
     try {
-        const res = await fetch("/admin/pending_summary", { headers: authHeaders() });
-        if (handleUnauthorized(res)) return;
-        const data = await res.json();
+        const data = dashboardPart("pending_summary") ?? await fetchJSON("/admin/pending_summary");
+        if (!data) return;
         const totalPending = data.reimbursement_pending + data.payment_pending;
         summaryText.innerHTML = totalPending > 0
             ? `<p>⚠️ <strong>Attention Admin:</strong> There are <strong>${totalPending}</strong> pending requests awaiting review:</p>
@@ -353,9 +381,9 @@ async function loadAdminRequests(type){
     tbody.innerHTML='<tr><td colspan="10">Loading requests...</td></tr>';
     if(currentRole!=='admin'){tbody.innerHTML='<tr><td colspan="10">Access Denied.</td></tr>';return;}
     try{
-        const res=await fetch(`/admin/requests?type=${type}`,{headers:authHeaders()});
-        if(handleUnauthorized(res))return;
-        const data=await res.json();
+        const all=dashboardPart("admin_requests");
+        const data=all ? all.filter(r=>r.type===type) : await fetchJSON(`/admin/requests?type=${type}`);
+        if(!data)return;
         tbody.innerHTML="";
         if (!data.length) {tbody.innerHTML=`<tr><td colspan='10'>No ${type} requests found for this month</td></tr>`; return;}
         data.forEach(r => tbody.appendChild(renderAdminReviewRow(r,type)));
@@ -364,6 +392,7 @@ async function loadAdminRequests(type){
 
 function renderAdminReviewRow(r,type) {
     const row = document.createElement('tr');
+    row.dataset.requestId = r.request_id || '';
     // FIX HERE: use <a> for attachment! The proofLink function now handles token inclusion.
     row.innerHTML = `
         <td>${escapeHTML(r.type)}</td>
@@ -426,6 +455,7 @@ async function updateStatus(id, status, type){
             const message=errorDetails.detail||`Server responded with status ${res.status}.`;
             throw new Error(message);
         }
+        invalidateDashboard();
         await loadAdminRequests(type);loadPendingRequestsSummary();
         if(currentRole==='staff'&&!document.getElementById("home").classList.contains("is-hidden")){loadStaffPendingRequests();}
     }catch(e){alert(`Failed to update status. Details: ${e.message||"Check console for server response."}`);}
@@ -462,6 +492,7 @@ async function loadHistoryRequestsTab(type){
 
 function renderRow(r,type){
     const row=document.createElement('tr');
+    row.dataset.requestId = r.request_id || '';
     // FIX HERE for attachment: The proofLink function now handles token inclusion.
     row.innerHTML=`
         <td>${escapeHTML(r.type)}</td>
@@ -522,6 +553,55 @@ async function loadRecordRequestsTab(type){
     }
 }
 
+// ---------- Live Updates (SSE) ----------
+// The server pushes request_created / status_changed events; rows already on screen are
+// patched in place instead of re-fetching whole tables.
+const LIVE_TABLES = [
+    ["#adminReimbursementTable", r => r.type === "reimbursement" && r.status !== "Paid", r => renderAdminReviewRow(r, "reimbursement")],
+    ["#adminPaymentTable", r => r.type === "payment" && r.status !== "Paid", r => renderAdminReviewRow(r, "payment")],
+    ["#recordsTable", r => r.type === "reimbursement", r => renderRow(r, "reimbursement")],
+    ["#paymentsTable", r => r.type === "payment", r => renderRow(r, "payment")],
+    ["#staffPendingReimbursementTable", r => r.type === "reimbursement" && r.status === "Pending", r => renderRow(r, "reimbursement")],
+    ["#staffPendingPaymentTable", r => r.type === "payment" && r.status === "Pending", r => renderRow(r, "payment")],
+    ["#historyReimbursementTable", r => r.type === "reimbursement", r => renderRow(r, "reimbursement")],
+    ["#historyPaymentTable", r => r.type === "payment", r => renderRow(r, "payment")],
+];
+function applyRequestEvent(rec) {
+    invalidateDashboard();
+    LIVE_TABLES.forEach(([selector, matches, render]) => {
+        const tbody = document.querySelector(`${selector} tbody`);
+        if (!tbody || !tbody.children.length) return; // never loaded
+        const existing = tbody.querySelector(`tr[data-request-id="${CSS.escape(rec.request_id || '')}"]`);
+        if (!matches(rec)) { if (existing) existing.remove(); return; }
+        const row = render(rec);
+        if (existing) { existing.replaceWith(row); return; }
+        // Drop "No ... yet" placeholder rows before adding the first real one
+        tbody.querySelectorAll("tr:not([data-request-id])").forEach(el => el.remove());
+        tbody.prepend(row);
+    });
+    if (currentRole === "admin") loadPendingRequestsSummary();
+}
+function refreshCurrentView() {
+    invalidateDashboard();
+    const visible = id => !document.getElementById(id)?.classList.contains("is-hidden");
+    if (visible("home")) { if (currentRole === "admin") loadPendingRequestsSummary(); else loadStaffPendingRequests(); }
+    if (visible("reimbursement")) loadMyRequests();
+    if (visible("payment")) loadMyPaymentRequests();
+    if (visible("admin-review-main")) { loadAdminRequests("reimbursement"); loadAdminRequests("payment"); }
+    if (visible("history")) loadHistoryRequests();
+    if (visible("record")) loadRecordRequests();
+}
+function connectEvents() {
+    if (!window.EventSource || !token) return;
+    if (eventSource) eventSource.close();
+    eventSource = new EventSource(`/events?token=${encodeURIComponent(token)}`);
+    const onRequest = e => { try { applyRequestEvent(JSON.parse(e.data).request); } catch {} };
+    eventSource.addEventListener("request_created", onRequest);
+    eventSource.addEventListener("status_changed", onRequest);
+    // Server dropped events for us (we fell behind): reload what is on screen
+    eventSource.addEventListener("resync", refreshCurrentView);
+}
+
 // ---------- Modal logic ----------
 const proofModal = document.getElementById("proofModal");
 const modalHeaderContent = document.getElementById('modalHeaderContent'); 
@@ -580,9 +660,8 @@ async function loadAdminUsers(){
     tbody.innerHTML="<tr><td colspan='4'>Loading users...</td></tr>";
     if (currentRole !== 'admin') { tbody.innerHTML = '<tr><td colspan="4">Access Denied.</td></tr>'; return; }
     try{
-        const res=await fetch("/admin/users",{headers:authHeaders()});
-        if(handleUnauthorized(res))return;
-        const data=await res.json();
+        const data=dashboardPart("users") ?? await fetchJSON("/admin/users");
+        if(!data)return;
         tbody.innerHTML=data.length?"":"<tr><td colspan='4'>No users found</td></tr>";
         data.forEach(u=>{
             const row=document.createElement('tr');
@@ -610,6 +689,7 @@ async function deleteUser(username) {
         if(handleUnauthorized(res))return;
         if(!res.ok) throw new Error("Delete failed");
         alert(`User ${username} deleted successfully.`);
+        invalidateDashboard();
         await loadAdminUsers();
     }catch(e){alert(`Failed to delete user. ${e.message||"Check console."}`);}
 }
@@ -629,6 +709,7 @@ document.getElementById("addUserForm")?.addEventListener("submit", async (e)=>{
         await res.json();
         e.target.reset();
         msgEl && (msgEl.textContent="User created successfully!");
+        invalidateDashboard();
         await loadAdminUsers();
     }catch{
         msgEl && (msgEl.textContent="Error creating user.");